@@ -0,0 +1,63 @@
+"""Admin endpoints for support staff."""
+
+import base64
+import json
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db
+from app.models import User
+from app.schemas import AdminUserOut, UserPage
+from app.services import AsyncUserService
+from app.auth import get_current_admin
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def _encode_cursor(value) -> str:
+    """Opaque page cursor holding the last sort key of a page."""
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def _decode_cursor(cursor: str, expected_type: type):
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        value = None
+    if not isinstance(value, expected_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return value
+
+
+@router.get("/users", response_model=UserPage)
+async def list_users(
+    q: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefix to search for"),
+    field: Literal["username", "email"] = Query("username", description="Column the prefix applies to"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(get_current_admin)
+):
+    """List users a page at a time, optionally by username or email prefix.
+    
+    Pages are keyset-paginated: pass the returned ``next_cursor`` to get the
+    following page. It is null on the last page.
+    """
+    # Searches page by the searched column, plain listings by id
+    sort_key = field if q else "id"
+    after = _decode_cursor(cursor, str if q else int) if cursor else None
+    
+    # Fetch one extra row to know whether another page exists
+    rows = await AsyncUserService.list_users(db, limit + 1, after, q, field)
+    items = [AdminUserOut(**row) for row in rows[:limit]]
+    
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(getattr(items[-1], sort_key))
+    
+    return UserPage(items=items, next_cursor=next_cursor)
@@ -1,18 +1,17 @@
 """Authentication endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db
 from app.models import User
 from app.schemas import (
     UserCreate, UserLogin, UserOut, Token, GoogleAuthRequest,
     ForgotPasswordRequest, ResetPasswordRequest, ResetPasswordWithCodeRequest, 
-    MessageResponse, PasswordVerifyRequest
+    MessageResponse, PasswordVerifyRequest, RefreshTokenRequest
 )
-from app.services import UserService, ResetService
-from app.utils.jwt import create_access_token
-from app.utils.security import verify_password
+from app.services import AsyncUserService, AsyncResetService, TokenService
+from app.utils.security import verify_password_async
 from app.auth.google_auth import verify_google_token
 from app.auth import get_current_user
 
@@ -20,24 +19,36 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserOut)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
-    user = UserService.create_user(db, user_data)
+    user = await AsyncUserService.create_user(db, user_data)
     return UserOut(id=user.id, username=user.username, has_pin=bool(user.hashed_pin))
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login with username/email and password."""
-    user = UserService.authenticate_user(db, user_data.username_or_email, user_data.password)
+    user = await AsyncUserService.authenticate_user(db, user_data.username_or_email, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username/email or password"
         )
     
-    access_token = create_access_token(data={"sub": user.username})
-    return Token(access_token=access_token, token_type="bearer")
+    return await TokenService.issue_tokens(db, user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Exchange a refresh token for a new access token and refresh token."""
+    return await TokenService.refresh(db, request.refresh_token)
+
+
+@router.post("/logout", response_model=MessageResponse)
+async def logout(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Revoke a refresh token."""
+    await TokenService.revoke(db, request.refresh_token)
+    return MessageResponse(message="Logged out successfully")
 
 
 @router.post("/verify-password", response_model=MessageResponse)
@@ -54,7 +65,7 @@ async def verify_password_endpoint(
         )
     
     # Verify password
-    if not current_user.hashed_password or not verify_password(request.password, current_user.hashed_password):
+    if not current_user.hashed_password or not await verify_password_async(request.password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid password"
@@ -64,7 +75,7 @@ async def verify_password_endpoint(
 
 
 @router.post("/google", response_model=Token)
-async def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(auth_data: GoogleAuthRequest, db: AsyncSession = Depends(get_async_db)):
     """Authenticate with Google OAuth."""
     # Verify Google token
     google_user = await verify_google_token(auth_data.token)
@@ -75,31 +86,30 @@ async def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db
         )
     
     # Create or get existing user
-    user = UserService.create_google_user(db, google_user)
+    user = await AsyncUserService.create_google_user(db, google_user)
     
-    # Create JWT token
-    access_token = create_access_token(data={"sub": user.username})
-    return Token(access_token=access_token, token_type="bearer")
+    # Create JWT and refresh tokens
+    return await TokenService.issue_tokens(db, user)
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
-async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+async def forgot_password(request: ForgotPasswordRequest, db: AsyncSession = Depends(get_async_db)):
     """Request password reset with verification code."""
-    message = ResetService.request_password_reset(db, request.email)
+    message = await AsyncResetService.request_password_reset(db, request.email)
     return MessageResponse(message=message)
 
 
 @router.post("/reset-password", response_model=MessageResponse)
-async def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)):
     """Reset password using token (URL-based reset)."""
-    message = ResetService.reset_password(db, request.token, request.new_password)
+    message = await AsyncResetService.reset_password(db, request.token, request.new_password)
     return MessageResponse(message=message)
 
 
 @router.post("/reset-password-with-code", response_model=MessageResponse)
-async def reset_password_with_code(request: ResetPasswordWithCodeRequest, db: Session = Depends(get_db)):
+async def reset_password_with_code(request: ResetPasswordWithCodeRequest, db: AsyncSession = Depends(get_async_db)):
     """Reset password using verification code (form-based reset)."""
-    message = ResetService.reset_password_with_code(
+    message = await AsyncResetService.reset_password_with_code(
         db, request.email, request.verification_code, request.new_password
     )
     return MessageResponse(message=message) 
\ No newline at end of file
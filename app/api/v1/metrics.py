@@ -0,0 +1,49 @@
+"""Internal diagnostics, restricted to admins."""
+
+from fastapi import APIRouter, Depends
+
+from app.db import pool_stats, compiled_cache_stats
+from app.core.startup_profile import startup_profile
+from app.utils.hash_pool import hash_pool
+from app.services.user_cache import user_cache
+from app.utils.jwt import token_cache
+from app.auth import get_current_admin
+
+# Pool, cache and SQL internals are not for the public API
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/hashing")
+async def hashing_metrics():
+    """Password hashing pool queue depth and wait time."""
+    return hash_pool.stats()
+
+
+@router.get("/tokens")
+async def token_cache_metrics():
+    """Verified JWT payload cache hit ratio."""
+    return token_cache.stats()
+
+
+@router.get("/user-cache")
+async def user_cache_metrics():
+    """User row cache hits, misses, evictions and invalidations."""
+    return user_cache.stats()
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    """Database connection pool checkouts, wait time, overflow and invalidations."""
+    return pool_stats()
+
+
+@router.get("/sql-cache")
+async def sql_cache_metrics():
+    """SQLAlchemy compiled statement cache hit ratio and the statements that miss."""
+    return compiled_cache_stats()
+
+
+@router.get("/startup")
+async def startup_metrics():
+    """Cold-start breakdown of import time and startup hooks."""
+    return startup_profile.report()
@@ -5,6 +5,8 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .users import router as users_router
 from .health import router as health_router
+from .admin import router as admin_router
+from .metrics import router as metrics_router
 
 # Create main API router
 api_router = APIRouter(prefix="/api/v1")
@@ -12,4 +14,6 @@ api_router = APIRouter(prefix="/api/v1")
 # Include all routers
 api_router.include_router(auth_router)
 api_router.include_router(users_router)
-api_router.include_router(health_router) 
\ No newline at end of file
+api_router.include_router(health_router)
+api_router.include_router(admin_router)
+api_router.include_router(metrics_router) 
\ No newline at end of file
@@ -1,6 +1,13 @@
 """Authentication package."""
 
-from .dependencies import get_current_user, get_optional_current_user
+from .dependencies import (
+    get_current_user, get_current_principal, get_optional_current_user, get_pin_verified_user,
+    get_current_admin
+)
+from .principal import Principal
 from .google_auth import verify_google_token
 
-__all__ = ["get_current_user", "get_optional_current_user", "verify_google_token"] 
\ No newline at end of file
+__all__ = [
+    "get_current_user", "get_current_principal", "get_optional_current_user",
+    "get_pin_verified_user", "get_current_admin", "Principal", "verify_google_token"
+] 
\ No newline at end of file
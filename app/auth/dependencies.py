@@ -2,55 +2,127 @@
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db
 from app.models import User
-from app.utils.jwt import verify_token
+from app.services.async_user_service import AsyncUserService
+from app.utils.jwt import verify_token, pin_fingerprint
+from app.auth.principal import Principal
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """Get the authenticated principal from token claims.
     
+    Only tokens issued by ``create_user_access_token`` are accepted; they
+    resolve without touching the database. Tokens without ``uid``/``ver``
+    claims (issued before token versioning) can't be revoked and must be
+    replaced by logging in again, and PIN tokens are not bearer tokens.
+    """
     try:
         # Verify token
         payload = verify_token(credentials.credentials)
         if payload is None:
-            raise credentials_exception
+            raise _credentials_exception()
         
         username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        if username is None or payload.get("pin_verified"):
+            raise _credentials_exception()
     except Exception:
-        raise credentials_exception
+        raise _credentials_exception()
+    
+    principal = Principal.from_claims(payload)
+    if principal is None:
+        raise _credentials_exception()
+    
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user, loading the full ORM row from the primary."""
+    principal = await get_current_principal(credentials)
     
     # Get user from database
-    user = db.query(User).filter(User.username == username).first()
+    user = await principal.load_user(db)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     return user
 
 
-def get_optional_current_user(
+async def get_current_admin(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Require an authenticated admin.
+    
+    The flag is read from the row on the primary (never the user cache or
+    token claims), so revoking admin access takes effect on the next request.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return current_user
+
+
+async def get_pin_verified_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """Accept a short-lived PIN token instead of re-verifying the PIN.
+    
+    No PIN hash is computed: the token's version and PIN fingerprint are
+    compared against the row on the primary (one primary-key lookup), so
+    a password reset or any PIN change revokes it. Returns the token claims.
+    """
+    payload = verify_token(credentials.credentials)
+    if payload is None or payload.get("sub") is None or payload.get("uid") is None:
+        raise _credentials_exception()
+    
+    if not payload.get("pin_verified"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="PIN verification required"
+        )
+    
+    user = await AsyncUserService.get_user_for_auth(db, payload["uid"])
+    if (
+        user is None
+        or not user.hashed_pin
+        or (user.token_version or 0) != payload.get("ver")
+        or pin_fingerprint(user.hashed_pin) != payload.get("pin")
+    ):
+        raise _credentials_exception()
+    
+    return payload
+
+
+async def get_optional_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current user if token is provided, otherwise return None."""
     if not credentials:
         return None
     
     try:
-        return get_current_user(credentials, db)
+        return await get_current_user(credentials, db)
     except HTTPException:
         return None 
\ No newline at end of file
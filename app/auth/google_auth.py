@@ -2,7 +2,6 @@
 
 import logging
 from typing import Optional
-import requests
 from fastapi import HTTPException, status
 
 from app.core.config import settings
@@ -13,6 +12,9 @@ logger = logging.getLogger(__name__)
 
 async def verify_google_token(token: str) -> Optional[GoogleUser]:
     """Verify Google ID token and return user information."""
+    # Imported here so app startup doesn't pay for requests/urllib3
+    import requests
+    
     try:
         # Remove 'Bearer ' prefix if present
         if token.startswith("Bearer "):
@@ -0,0 +1,49 @@
+"""Lightweight authenticated principal built from token claims."""
+
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User
+from app.services.async_user_service import AsyncUserService
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user as described by the access token.
+    
+    Endpoints that only read identity fields can depend on this instead of
+    the ORM ``User`` and skip the database entirely. Claims reflect the
+    user at the time the token was issued.
+    """
+    id: int
+    username: str
+    has_pin: bool = False
+    is_google_user: bool = False
+    token_version: int = 0
+    
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """Build a principal from token claims, or None for tokens without a user id or version."""
+        user_id = payload.get("uid")
+        username = payload.get("sub")
+        if user_id is None or username is None or payload.get("ver") is None:
+            return None
+        return cls(
+            id=user_id,
+            username=username,
+            has_pin=bool(payload.get("has_pin")),
+            is_google_user=bool(payload.get("google")),
+            token_version=payload["ver"],
+        )
+    
+    async def load_user(self, db: AsyncSession) -> Optional[User]:
+        """Load the full user by primary key from the primary, rejecting revoked tokens.
+        
+        Never served from the user cache: callers check the password/PIN
+        hashes, ``token_version`` and ``is_admin`` on the returned row.
+        """
+        user = await AsyncUserService.get_user_for_auth(db, self.id)
+        if user is None or (user.token_version or 0) != self.token_version:
+            return None
+        return user
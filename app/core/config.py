@@ -14,18 +14,88 @@ class Settings(BaseSettings):
     app_name: str = "ChildSafe API"
     app_version: str = "1.0.0"
     description: str = "Secure content filtering service"
+    # "production" disables DDL on startup
+    environment: str = os.getenv("ENVIRONMENT", "development")
+    # Cold-start budget in ms; startup logs a warning when over it (0 disables)
+    startup_budget_ms: int = int(os.getenv("STARTUP_BUDGET_MS", "0"))
     
     # Security
     secret_key: str = os.getenv("SECRET_KEY", "your-super-secure-secret-key-change-in-production")
-    algorithm: str = "HS256"
+    algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
+    # Asymmetric signing (ES256/RS256): directory of <kid>.pem private keys
+    jwt_keys_dir: Optional[str] = os.getenv("JWT_KEYS_DIR")
+    jwt_active_kid: Optional[str] = os.getenv("JWT_ACTIVE_KID")
+    jwks_max_age_seconds: int = int(os.getenv("JWKS_MAX_AGE_SECONDS", "3600"))
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    pin_token_expire_minutes: int = int(os.getenv("PIN_TOKEN_EXPIRE_MINUTES", "5"))
+    # Verified token payload cache (size 0 disables it)
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+    token_cache_ttl_seconds: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    # Read-through user row cache (size or TTL 0 disables it)
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    user_cache_ttl_seconds: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    # "local" (per process) or "redis" (shared across workers)
+    user_cache_backend: str = os.getenv("USER_CACHE_BACKEND", "local")
+    user_cache_redis_url: Optional[str] = os.getenv("USER_CACHE_REDIS_URL")
     
-    # Database
+    # Password hashing (0 = one worker per CPU core)
+    hash_pool_workers: int = int(os.getenv("HASH_POOL_WORKERS", "0"))
+    # Hashing tasks allowed to wait for a worker before new ones get a 503
+    hash_pool_max_queue: int = int(os.getenv("HASH_POOL_MAX_QUEUE", "32"))
+    # Comma-separated passlib schemes; the first one is used for new hashes
+    password_schemes: str = os.getenv("PASSWORD_SCHEMES", "bcrypt")
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    argon2_time_cost: int = int(os.getenv("ARGON2_TIME_COST", "3"))
+    argon2_memory_cost: int = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+    argon2_parallelism: int = int(os.getenv("ARGON2_PARALLELISM", "1"))
+    
+    # Database. DATABASE_URL (any SQLAlchemy URL, e.g. sqlite:///./childsafe.db)
+    # overrides the MySQL settings below; ASYNC_DATABASE_URL defaults to the
+    # async driver for the same database.
+    database_url_override: Optional[str] = os.getenv("DATABASE_URL")
+    async_database_url_override: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
     mysql_user: str = os.getenv("MYSQL_USER", "root")
     mysql_password: str = os.getenv("MYSQL_PASSWORD", "password")
     mysql_host: str = os.getenv("MYSQL_HOST", "localhost")
     mysql_port: str = os.getenv("MYSQL_PORT", "3306")
     mysql_database: str = os.getenv("MYSQL_DATABASE", "childsafe_db")
+    # DBAPI drivers: mysqldb (mysqlclient, C) or pymysql for the sync engine,
+    # aiomysql or asyncmy for the async engine
+    mysql_driver: str = os.getenv("MYSQL_DRIVER", "mysqldb")
+    mysql_async_driver: str = os.getenv("MYSQL_ASYNC_DRIVER", "aiomysql")
+    # Comma-separated read replicas as host or host:port (same credentials)
+    mysql_replica_hosts: str = os.getenv("MYSQL_REPLICA_HOSTS", "")
+    
+    # Connection pool (per engine, per worker process)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    # Compiled SQL strings cached per engine
+    db_query_cache_size: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+    
+    # Per-request SQL instrumentation (Server-Timing header and budget warnings)
+    sql_instrumentation: bool = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+    # Statements allowed per request before it is logged
+    sql_query_budget: int = int(os.getenv("SQL_QUERY_BUDGET", "10"))
+    # Per-route overrides: "METHOD /path=budget,..." using the route template
+    sql_query_budgets: str = os.getenv("SQL_QUERY_BUDGETS", "")
+    # Identical statements per request that are flagged as a likely N+1
+    sql_repeat_threshold: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "3"))
+    
+    # SQLite tuning, applied to every new connection (WAL is always on)
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_kb: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    sqlite_mmap_size_mb: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    
+    # Background purge of used/expired tokens (interval 0 disables it)
+    token_purge_interval_seconds: int = int(os.getenv("TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+    token_purge_batch_size: int = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", "1000"))
+    token_purge_pause_seconds: float = float(os.getenv("TOKEN_PURGE_PAUSE_SECONDS", "0.5"))
+    # Apply pending migrations at startup instead of only checking the version
+    auto_migrate: bool = os.getenv("AUTO_MIGRATE", "false").lower() == "true"
     
     # Google OAuth
     google_client_id: Optional[str] = os.getenv("GOOGLE_CLIENT_ID")
@@ -45,14 +115,58 @@ class Settings(BaseSettings):
     ]
     
     @property
-    def database_url(self) -> str:
-        """Construct database URL."""
+    def is_production(self) -> bool:
+        """Whether the app runs in production mode."""
+        return self.environment.lower() == "production"
+    
+    @property
+    def is_sqlite(self) -> bool:
+        """Whether the configured database is SQLite."""
+        return self.database_url.startswith("sqlite")
+    
+    def mysql_url(self, driver: str, host: Optional[str] = None, port: Optional[str] = None) -> str:
+        """Construct a MySQL URL for a given DBAPI driver."""
         return (
-            f"mysql+pymysql://{self.mysql_user}:{self.mysql_password}"
-            f"@{self.mysql_host}:{self.mysql_port}/{self.mysql_database}"
+            f"mysql+{driver}://{self.mysql_user}:{self.mysql_password}"
+            f"@{host or self.mysql_host}:{port or self.mysql_port}/{self.mysql_database}"
             f"?charset=utf8mb4"
         )
     
+    @property
+    def database_url(self) -> str:
+        """Construct database URL."""
+        if self.database_url_override:
+            return self.database_url_override
+        return self.mysql_url(self.mysql_driver)
+    
+    @property
+    def async_database_url(self) -> str:
+        """Construct async database URL (MYSQL_ASYNC_DRIVER or aiosqlite)."""
+        if self.async_database_url_override:
+            return self.async_database_url_override
+        if self.database_url_override:
+            backend, _, rest = self.database_url_override.partition("://")
+            dialect = backend.split("+")[0]
+            async_drivers = {"mysql": f"mysql+{self.mysql_async_driver}", "sqlite": "sqlite+aiosqlite"}
+            if dialect not in async_drivers:
+                raise ValueError(f"No async driver known for {backend}; set ASYNC_DATABASE_URL")
+            return f"{async_drivers[dialect]}://{rest}"
+        return self.mysql_url(self.mysql_async_driver)
+    
+    @property
+    def async_replica_database_urls(self) -> list[str]:
+        """Construct async database URLs for the read replicas."""
+        urls = []
+        if self.is_sqlite:
+            return urls
+        for replica in self.mysql_replica_hosts.split(","):
+            replica = replica.strip()
+            if not replica:
+                continue
+            host, _, port = replica.partition(":")
+            urls.append(self.mysql_url(self.mysql_async_driver, host, port))
+        return urls
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
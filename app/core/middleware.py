@@ -0,0 +1,76 @@
+"""HTTP middleware."""
+
+import logging
+import time
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.db import query_tracker
+
+logger = logging.getLogger(__name__)
+
+
+def parse_query_budgets(value: str) -> dict[str, int]:
+    """Parse "METHOD /path=budget,..." into {"METHOD /path": budget}."""
+    budgets = {}
+    for item in value.split(","):
+        route, _, budget = item.strip().rpartition("=")
+        if route and budget.strip().isdigit():
+            budgets[" ".join(route.split())] = int(budget)
+    return budgets
+
+
+query_budgets = parse_query_budgets(settings.sql_query_budgets)
+
+
+def route_template(request: Request) -> str:
+    """Full route template of a request, e.g. ``/api/v1/users/{id}``.
+    
+    Depending on the FastAPI version, routes of included routers report
+    their path relative to the router (``/auth/login``). The missing prefix
+    is taken from the leading segments of the actual URL, so the key always
+    matches the documented ``METHOD /api/v1/...`` form.
+    """
+    path = getattr(request.scope.get("route"), "path", None)
+    if path is None:
+        return request.url.path
+    url_segments = [segment for segment in request.url.path.split("/") if segment]
+    route_segments = [segment for segment in path.split("/") if segment]
+    prefix = url_segments[:max(0, len(url_segments) - len(route_segments))]
+    return "/" + "/".join(prefix) + path if prefix else path
+
+
+async def sql_instrumentation_middleware(request: Request, call_next):
+    """Count statements and DB time per request.
+    
+    Adds a ``Server-Timing`` header (``db`` with duration and statement
+    count, plus ``app`` for the whole request), logs requests over their
+    route's query budget and warns about identical statements repeated
+    within one request, the usual sign of an N+1 loop.
+    """
+    queries, token = query_tracker.start_tracking()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        query_tracker.stop_tracking(token)
+    elapsed = time.perf_counter() - started
+    
+    response.headers.append(
+        "Server-Timing",
+        f'db;dur={queries.db_time * 1000:.1f};desc="{queries.count} queries", app;dur={elapsed * 1000:.1f}'
+    )
+    
+    route_key = f"{request.method} {route_template(request)}"
+    budget = query_budgets.get(route_key, settings.sql_query_budget)
+    if queries.count > budget:
+        logger.warning(
+            f"{route_key} issued {queries.count} queries (budget {budget}), "
+            f"{queries.db_time * 1000:.1f} ms in the database"
+        )
+    
+    for statement, count in queries.repeated(settings.sql_repeat_threshold):
+        logger.warning(f"{route_key} ran the same statement {count} times (possible N+1): {' '.join(statement.split())[:200]}")
+    
+    return response
@@ -0,0 +1,73 @@
+"""Cold-start profiling: import time and startup hook durations."""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """Wall-clock timings for each import group and startup hook.
+    
+    Phases are recorded in the order they ran, so the report reads as a
+    timeline from the first app import to the end of the startup event.
+    """
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: list[tuple[str, str, float]] = []
+        self.modules_at_start = len(sys.modules)
+        self.modules_loaded: Optional[int] = None
+        self.ready_at: Optional[float] = None
+    
+    @contextmanager
+    def phase(self, name: str, kind: str = "hook"):
+        """Time a block of work as one named phase (``kind`` is "import" or "hook")."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((kind, name, time.perf_counter() - start))
+    
+    def mark_ready(self) -> None:
+        """Record the end of startup."""
+        self.ready_at = time.perf_counter()
+        self.modules_loaded = len(sys.modules) - self.modules_at_start
+    
+    def total_ms(self, kind: Optional[str] = None) -> float:
+        """Total milliseconds spent in phases of one kind, or in all of them."""
+        return round(sum(elapsed for k, _, elapsed in self.phases if kind is None or k == kind) * 1000, 3)
+    
+    def report(self) -> dict:
+        """Return the startup breakdown."""
+        elapsed = (self.ready_at or time.perf_counter()) - self.started_at
+        return {
+            "ready": self.ready_at is not None,
+            "total_ms": round(elapsed * 1000, 3),
+            "import_ms": self.total_ms("import"),
+            "hooks_ms": self.total_ms("hook"),
+            "modules_loaded": self.modules_loaded,
+            "phases": [
+                {"kind": kind, "name": name, "ms": round(elapsed * 1000, 3)}
+                for kind, name, elapsed in self.phases
+            ],
+        }
+    
+    def log_report(self, budget_ms: int = 0) -> None:
+        """Log the breakdown, warning if startup went over ``budget_ms`` (0 disables the check)."""
+        report = self.report()
+        lines = [f"  {p['kind']:<6} {p['name']:<32} {p['ms']:>10.1f} ms" for p in report["phases"]]
+        logger.info(
+            f"Startup took {report['total_ms']:.1f} ms "
+            f"(imports {report['import_ms']:.1f} ms, hooks {report['hooks_ms']:.1f} ms, "
+            f"{report['modules_loaded']} modules loaded)\n" + "\n".join(lines)
+        )
+        if budget_ms and report["total_ms"] > budget_ms:
+            logger.warning(f"Startup took {report['total_ms']:.1f} ms, over the {budget_ms} ms budget")
+
+
+# Global startup profile, created when main.py first imports it
+startup_profile = StartupProfile()
@@ -1,5 +1,12 @@
 """Database package."""
 
-from .database import Base, get_db, create_tables, engine, SessionLocal
+from .database import (
+    Base, get_db, get_async_db, create_tables, engine, SessionLocal, async_engine, AsyncSessionLocal,
+    replica_engines, use_primary, pool_stats, compiled_cache_stats
+)
 
-__all__ = ["Base", "get_db", "create_tables", "engine", "SessionLocal"] 
\ No newline at end of file
+__all__ = [
+    "Base", "get_db", "get_async_db", "create_tables", "engine", "SessionLocal",
+    "async_engine", "AsyncSessionLocal", "replica_engines", "use_primary", "pool_stats",
+    "compiled_cache_stats"
+] 
\ No newline at end of file
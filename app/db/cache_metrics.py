@@ -0,0 +1,63 @@
+"""SQLAlchemy compiled statement cache instrumentation."""
+
+import threading
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+# Distinct uncached statements remembered for the report
+MAX_TRACKED_MISSES = 50
+
+
+class CompiledCacheMetrics:
+    """Counts how often an engine's statements come from the compiled cache.
+    
+    A miss means SQLAlchemy compiled the statement to SQL for that call.
+    Once warm, hot paths should be all hits; statements that keep missing
+    are listed so they can be turned into pre-built ones.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self._missed_statements: Counter = Counter()
+    
+    def attach(self, engine: Engine) -> None:
+        """Listen for executions on a (sync) engine."""
+        @event.listens_for(engine, "after_cursor_execute")
+        def on_execute(connection, cursor, statement, parameters, context, executemany):
+            cache_hit = getattr(context, "cache_hit", None)
+            with self._lock:
+                if cache_hit == CacheStats.CACHE_HIT:
+                    self.hits += 1
+                elif cache_hit == CacheStats.CACHE_MISS:
+                    self.misses += 1
+                    key = " ".join(statement.split())[:200]
+                    if key in self._missed_statements or len(self._missed_statements) < MAX_TRACKED_MISSES:
+                        self._missed_statements[key] += 1
+                else:
+                    # Caching disabled, no cache key or raw driver SQL
+                    self.uncacheable += 1
+    
+    def stats(self, engine: Engine) -> dict:
+        """Return the hit ratio together with the cache's current fill."""
+        cache = getattr(engine, "_compiled_cache", None)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_size": len(cache) if cache is not None else 0,
+                "cache_capacity": getattr(cache, "capacity", 0),
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncacheable": self.uncacheable,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "top_misses": [
+                    {"statement": statement, "count": count}
+                    for statement, count in self._missed_statements.most_common(10)
+                ],
+            }
@@ -1,21 +1,146 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
+import random
+from sqlalchemy import create_engine, event, Select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics
+from app.db.cache_metrics import CompiledCacheMetrics
+from app.db import query_tracker
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+sync_cache_metrics = CompiledCacheMetrics("sync")
+async_cache_metrics = CompiledCacheMetrics("async")
+
+pool_options = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+)
+
+if settings.is_sqlite:
+    # Pooled connections move between threads; SQLite's own lock serialises writers
+    pool_options["connect_args"] = {"check_same_thread": False}
+
+
+def apply_sqlite_pragmas(engine) -> None:
+    """Tune every new SQLite connection for concurrent local use.
+    
+    WAL lets readers run alongside the single writer, synchronous=NORMAL
+    only fsyncs at checkpoints, and foreign_keys=ON makes the ON DELETE
+    CASCADE constraints on token tables take effect.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False
+    poolclass=sync_pool_metrics.pool_class(QueuePool),
+    echo=False,
+    query_cache_size=settings.db_query_cache_size,
+    **pool_options
 )
+sync_pool_metrics.attach(engine)
+sync_cache_metrics.attach(engine)
+query_tracker.attach(engine)
+if settings.is_sqlite:
+    apply_sqlite_pragmas(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine and session factory for the API
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=async_pool_metrics.pool_class(AsyncAdaptedQueuePool),
+    echo=False,
+    query_cache_size=settings.db_query_cache_size,
+    **pool_options
+)
+async_pool_metrics.attach(async_engine.sync_engine)
+async_cache_metrics.attach(async_engine.sync_engine)
+query_tracker.attach(async_engine.sync_engine)
+if settings.is_sqlite:
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
+# Create read replica engines
+replica_engines = []
+replica_pool_metrics = []
+replica_cache_metrics = []
+for index, replica_url in enumerate(settings.async_replica_database_urls):
+    metrics = PoolMetrics(f"replica-{index}")
+    cache_metrics = CompiledCacheMetrics(f"replica-{index}")
+    replica = create_async_engine(
+        replica_url,
+        poolclass=metrics.pool_class(AsyncAdaptedQueuePool),
+        echo=False,
+        query_cache_size=settings.db_query_cache_size,
+        **pool_options
+    )
+    metrics.attach(replica.sync_engine)
+    cache_metrics.attach(replica.sync_engine)
+    query_tracker.attach(replica.sync_engine)
+    replica_engines.append(replica)
+    replica_pool_metrics.append(metrics)
+    replica_cache_metrics.append(cache_metrics)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica until its first write.
+    
+    Once the session flushes or executes a non-SELECT statement it sticks
+    to the primary for the rest of its life, so a request always reads its
+    own writes. Call ``use_primary`` to pin a session up front, e.g. for
+    read-modify-write flows that can't tolerate replica lag.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engines and not self.info.get("use_primary"):
+            is_read = (
+                not self._flushing
+                and isinstance(clause, Select)
+                and clause._for_update_arg is None
+            )
+            if is_read:
+                if "replica" not in self.info:
+                    self.info["replica"] = random.choice(replica_engines).sync_engine
+                return self.info["replica"]
+            self.info["use_primary"] = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def use_primary(db) -> None:
+    """Route every further statement of a session to the primary."""
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info["use_primary"] = True
+
+
+# Objects stay usable after commit; async sessions can't lazily reload them
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create declarative base for models
 Base = declarative_base()
 
@@ -29,6 +154,36 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats() -> dict:
+    """Connection pool metrics for both engines."""
+    return {
+        "sync": sync_pool_metrics.stats(engine),
+        "async": async_pool_metrics.stats(async_engine.sync_engine),
+        "replicas": [
+            metrics.stats(replica.sync_engine)
+            for metrics, replica in zip(replica_pool_metrics, replica_engines)
+        ],
+    }
+
+
+def compiled_cache_stats() -> dict:
+    """Compiled statement cache hit ratio for both engines."""
+    return {
+        "sync": sync_cache_metrics.stats(engine),
+        "async": async_cache_metrics.stats(async_engine.sync_engine),
+        "replicas": [
+            metrics.stats(replica.sync_engine)
+            for metrics, replica in zip(replica_cache_metrics, replica_engines)
+        ],
+    }
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine) 
\ No newline at end of file
@@ -1,20 +1,106 @@
-"""Database migrations for schema updates."""
+"""Database migrations for schema updates.
 
+Applied migrations are recorded in the ``schema_migrations`` ledger, so each
+step runs once per database. Apply them with ``python migrate_database.py``;
+app startup only compares the ledger version against ``SCHEMA_VERSION``.
+"""
+
+import datetime
 import logging
-from sqlalchemy import text
-from app.db.database import engine
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from app.db.database import engine, Base
 
 logger = logging.getLogger(__name__)
 
+# Rows converted per UPDATE when backfilling columns
+MIGRATION_BATCH_SIZE = 5000
+
+# MySQL named lock held while applying migrations
+MIGRATION_LOCK_NAME = "childsafe_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+
+def create_base_tables(connection):
+    """Create any missing tables from the current models."""
+    import app.models  # noqa: F401  (register models on Base.metadata)
+    Base.metadata.create_all(bind=connection)
+    connection.commit()
+
+
+def ensure_migration_ledger(connection):
+    """Create the schema_migrations table if it doesn't exist."""
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT NOT NULL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """))
+    connection.commit()
+
+
+def get_schema_version(connection) -> int:
+    """Return the highest applied migration version (0 if the ledger is missing)."""
+    try:
+        return connection.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar() or 0
+    except DBAPIError:
+        connection.rollback()
+        return 0
+
+
+def record_migration(connection, version: int, name: str):
+    """Mark a migration as applied in the ledger."""
+    connection.execute(text("""
+        INSERT INTO schema_migrations (version, name, applied_at)
+        VALUES (:version, :name, :applied_at)
+    """), {"version": version, "name": name, "applied_at": datetime.datetime.utcnow()})
+    connection.commit()
+
 
 def run_migrations():
-    """Run all pending database migrations."""
+    """Apply all pending migrations under a database lock."""
     logger.info("Running database migrations...")
     
     try:
         with engine.connect() as connection:
-            # Migration 1: Add verification_code column to reset_tokens table
-            add_verification_code_column(connection)
+            # SQLite serialises writers itself; MySQL needs a named lock across hosts
+            is_mysql = connection.dialect.name == "mysql"
+            if is_mysql:
+                acquired = connection.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"),
+                    {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT}
+                ).scalar()
+                if not acquired:
+                    raise RuntimeError("Timed out waiting for the migration lock")
+            
+            try:
+                ensure_migration_ledger(connection)
+                current_version = get_schema_version(connection)
+                # An empty database is built straight from the current models,
+                # so none of the upgrade steps after create_base_tables apply
+                is_fresh = current_version == 0 and not inspect(connection).has_table("users")
+                
+                for version, name, migration in MIGRATIONS:
+                    if version <= current_version:
+                        continue
+                    if version in MYSQL_ONLY_MIGRATIONS and not is_mysql:
+                        raise RuntimeError(
+                            f"Migration {version} ({name}) only supports MySQL; rebuild this "
+                            f"{connection.dialect.name} database from the current models instead"
+                        )
+                    logger.info(f"Applying migration {version}: {name}")
+                    migration(connection)
+                    record_migration(connection, version, name)
+                    
+                    if version == 1 and is_fresh:
+                        for later_version, later_name, _ in MIGRATIONS[1:]:
+                            record_migration(connection, later_version, later_name)
+                        break
+            finally:
+                if is_mysql:
+                    connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+                    connection.commit()
             
         logger.info("All migrations completed successfully!")
         
@@ -23,6 +109,22 @@ def run_migrations():
         raise
 
 
+def check_schema_version() -> bool:
+    """Compare the database schema version against the code with a single query."""
+    with engine.connect() as connection:
+        version = get_schema_version(connection)
+    
+    if version < SCHEMA_VERSION:
+        logger.warning(
+            f"Database schema is at version {version}, code expects {SCHEMA_VERSION}. "
+            f"Run `python migrate_database.py` to apply pending migrations."
+        )
+        return False
+    
+    logger.info(f"Database schema is up to date (version {version})")
+    return True
+
+
 def add_verification_code_column(connection):
     """Add verification_code column to reset_tokens table if it doesn't exist."""
     try:
@@ -50,4 +152,242 @@ def add_verification_code_column(connection):
             
     except Exception as e:
         logger.error(f"Failed to add verification_code column: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+def add_token_version_column(connection):
+    """Add token_version column to users table if it doesn't exist."""
+    try:
+        result = connection.execute(text("""
+            SELECT COUNT(*) as count 
+            FROM information_schema.columns 
+            WHERE table_name = 'users' 
+            AND column_name = 'token_version'
+            AND table_schema = DATABASE()
+        """))
+        
+        column_exists = result.fetchone()[0] > 0
+        
+        if not column_exists:
+            logger.info("Adding token_version column to users table...")
+            connection.execute(text("""
+                ALTER TABLE users 
+                ADD COLUMN token_version INT NOT NULL DEFAULT 0
+            """))
+            connection.commit()
+            logger.info("✅ token_version column added successfully!")
+        else:
+            logger.info("✅ token_version column already exists, skipping migration")
+            
+    except Exception as e:
+        logger.error(f"Failed to add token_version column: {str(e)}")
+        raise
+
+
+def add_admin_column(connection):
+    """Add is_admin column to users table if it doesn't exist."""
+    try:
+        result = connection.execute(text("""
+            SELECT COUNT(*) as count 
+            FROM information_schema.columns 
+            WHERE table_name = 'users' 
+            AND column_name = 'is_admin'
+            AND table_schema = DATABASE()
+        """))
+        
+        column_exists = result.fetchone()[0] > 0
+        
+        if not column_exists:
+            logger.info("Adding is_admin column to users table...")
+            connection.execute(text("""
+                ALTER TABLE users 
+                ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT FALSE
+            """))
+            connection.commit()
+            logger.info("✅ is_admin column added successfully!")
+        else:
+            logger.info("✅ is_admin column already exists, skipping migration")
+            
+    except Exception as e:
+        logger.error(f"Failed to add is_admin column: {str(e)}")
+        raise
+
+
+def convert_reset_token_expiry(connection, batch_size: int = MIGRATION_BATCH_SIZE):
+    """Convert reset_tokens.expires_at from an ISO string to DATETIME.
+    
+    Existing rows are copied into a new column in primary-key batches so no
+    single UPDATE holds locks on the whole table, then the columns are swapped
+    and the composite live-token index is created. MySQL commits each DDL
+    statement, so every step checks what is already done and a run that
+    failed part-way resumes where it stopped.
+    """
+    try:
+        result = connection.execute(text("""
+            SELECT column_name, data_type 
+            FROM information_schema.columns 
+            WHERE table_name = 'reset_tokens' 
+            AND column_name IN ('expires_at', 'expires_at_dt')
+            AND table_schema = DATABASE()
+        """))
+        columns = {name.lower(): data_type.lower() for name, data_type in result.fetchall()}
+        
+        if columns.get("expires_at", "datetime") != "datetime" or "expires_at_dt" in columns:
+            logger.info("Converting reset_tokens.expires_at to DATETIME...")
+            if "expires_at_dt" not in columns:
+                connection.execute(text("""
+                    ALTER TABLE reset_tokens 
+                    ADD COLUMN expires_at_dt DATETIME NULL
+                """))
+                connection.commit()
+            
+            if "expires_at" in columns:
+                bounds = connection.execute(text("SELECT MIN(id), MAX(id) FROM reset_tokens")).fetchone()
+                if bounds[0] is not None:
+                    for start in range(bounds[0], bounds[1] + 1, batch_size):
+                        # Only well-formed values reach STR_TO_DATE (strict mode turns
+                        # its bad-input warning into an error); the rest become the
+                        # epoch, i.e. already expired. Fractions and offsets are dropped.
+                        connection.execute(text("""
+                            UPDATE reset_tokens 
+                            SET expires_at_dt = COALESCE(
+                                CASE WHEN expires_at REGEXP '^[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])[T ]([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]'
+                                    THEN STR_TO_DATE(LEFT(REPLACE(expires_at, 'T', ' '), 19), '%Y-%m-%d %H:%i:%s')
+                                END,
+                                '1970-01-01 00:00:00'
+                            )
+                            WHERE id >= :start AND id < :end 
+                            AND expires_at_dt IS NULL
+                        """), {"start": start, "end": start + batch_size})
+                        connection.commit()
+                
+                connection.execute(text("ALTER TABLE reset_tokens DROP COLUMN expires_at"))
+                connection.commit()
+            
+            connection.execute(text("""
+                ALTER TABLE reset_tokens 
+                CHANGE COLUMN expires_at_dt expires_at DATETIME NOT NULL
+            """))
+            connection.commit()
+            logger.info("✅ reset_tokens.expires_at converted successfully!")
+        else:
+            logger.info("✅ reset_tokens.expires_at is already DATETIME, skipping conversion")
+        
+        result = connection.execute(text("""
+            SELECT COUNT(*) as count 
+            FROM information_schema.statistics 
+            WHERE table_name = 'reset_tokens' 
+            AND index_name = 'ix_reset_tokens_user_type_used_expires'
+            AND table_schema = DATABASE()
+        """))
+        
+        if result.fetchone()[0] == 0:
+            logger.info("Adding live-token index to reset_tokens table...")
+            connection.execute(text("""
+                CREATE INDEX ix_reset_tokens_user_type_used_expires 
+                ON reset_tokens (user_id, token_type, used, expires_at)
+            """))
+            connection.commit()
+            logger.info("✅ reset_tokens index added successfully!")
+        else:
+            logger.info("✅ reset_tokens index already exists, skipping migration")
+            
+    except Exception as e:
+        logger.error(f"Failed to convert reset_tokens.expires_at: {str(e)}")
+        raise
+
+
+def add_token_foreign_keys(connection):
+    """Add ON DELETE CASCADE foreign keys from token tables to users if missing.
+    
+    Orphaned token rows (whose user no longer exists) are deleted first,
+    otherwise the constraint can't be created.
+    """
+    foreign_keys = [
+        ("reset_tokens", "fk_reset_tokens_user_id"),
+        ("refresh_tokens", "fk_refresh_tokens_user_id"),
+    ]
+    try:
+        for table_name, constraint_name in foreign_keys:
+            result = connection.execute(text("""
+                SELECT COUNT(*) as count 
+                FROM information_schema.referential_constraints 
+                WHERE constraint_name = :constraint_name
+                AND constraint_schema = DATABASE()
+            """), {"constraint_name": constraint_name})
+            
+            if result.fetchone()[0] > 0:
+                logger.info(f"✅ {constraint_name} already exists, skipping migration")
+                continue
+            
+            logger.info(f"Adding {constraint_name} to {table_name} table...")
+            connection.execute(text(f"""
+                DELETE FROM {table_name} 
+                WHERE user_id IS NULL 
+                OR user_id NOT IN (SELECT id FROM users)
+            """))
+            connection.execute(text(f"""
+                ALTER TABLE {table_name} 
+                MODIFY COLUMN user_id INT NOT NULL,
+                ADD CONSTRAINT {constraint_name} 
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            """))
+            connection.commit()
+            logger.info(f"✅ {constraint_name} added successfully!")
+            
+    except Exception as e:
+        logger.error(f"Failed to add token foreign keys: {str(e)}")
+        raise
+
+
+def add_token_expiry_indexes(connection):
+    """Add the indexes the token purge deletes by, if missing."""
+    indexes = [
+        ("reset_tokens", "ix_reset_tokens_used_expires", "used, expires_at"),
+        ("refresh_tokens", "ix_refresh_tokens_expires_at", "expires_at"),
+    ]
+    try:
+        for table_name, index_name, columns in indexes:
+            if connection.dialect.name != "mysql":
+                # SQLite databases get this step too, and support IF NOT EXISTS
+                connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
+                connection.commit()
+                continue
+            
+            result = connection.execute(text("""
+                SELECT COUNT(*) as count 
+                FROM information_schema.statistics 
+                WHERE table_name = :table_name 
+                AND index_name = :index_name
+                AND table_schema = DATABASE()
+            """), {"table_name": table_name, "index_name": index_name})
+            
+            if result.fetchone()[0] > 0:
+                logger.info(f"✅ {index_name} already exists, skipping migration")
+                continue
+            
+            logger.info(f"Adding {index_name} to {table_name} table...")
+            connection.execute(text(f"CREATE INDEX {index_name} ON {table_name} ({columns})"))
+            connection.commit()
+            logger.info(f"✅ {index_name} added successfully!")
+            
+    except Exception as e:
+        logger.error(f"Failed to add token expiry indexes: {str(e)}")
+        raise
+
+
+# Ordered migration steps: (version, name, function). Append only.
+MIGRATIONS = [
+    (1, "create_base_tables", create_base_tables),
+    (2, "add_verification_code_column", add_verification_code_column),
+    (3, "add_token_version_column", add_token_version_column),
+    (4, "convert_reset_token_expiry", convert_reset_token_expiry),
+    (5, "add_token_foreign_keys", add_token_foreign_keys),
+    (6, "add_admin_column", add_admin_column),
+    (7, "add_token_expiry_indexes", add_token_expiry_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Upgrade steps written against MySQL (information_schema, DATABASE(), MODIFY COLUMN)
+MYSQL_ONLY_MIGRATIONS = {2, 3, 4, 5, 6}
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Connection pool instrumentation."""
+
+import threading
+import time
+from typing import Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.max_overflow_used = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def record_wait(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.waits += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+    
+    def pool_class(self, base: Type[QueuePool]) -> Type[QueuePool]:
+        """Return a subclass of ``base`` that times how long checkouts wait."""
+        metrics = self
+        
+        def _do_get(pool):
+            start = time.perf_counter()
+            try:
+                connection = base._do_get(pool)
+            except PoolTimeoutError:
+                metrics.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            metrics.record_wait(time.perf_counter() - start)
+            return connection
+        
+        return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+    
+    def attach(self, engine: Engine) -> None:
+        """Listen for pool events on a (sync) engine."""
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+        
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            pool = engine.pool
+            overflow = pool.overflow() if hasattr(pool, "overflow") else 0
+            with self._lock:
+                self.checkouts += 1
+                if overflow > 0:
+                    self.overflow_checkouts += 1
+                    self.max_overflow_used = max(self.max_overflow_used, overflow)
+        
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+        
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+    
+    def stats(self, engine: Engine) -> dict:
+        """Return counters together with the pool's live state."""
+        pool = engine.pool
+        live = {}
+        if isinstance(pool, QueuePool):
+            live = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+            }
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                **live,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_used": self.max_overflow_used,
+                "avg_wait_ms": round(self.total_wait / self.waits * 1000, 3) if self.waits else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
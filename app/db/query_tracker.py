@@ -0,0 +1,58 @@
+"""Per-request SQL statement counting."""
+
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestQueries:
+    """Statements issued while handling one request."""
+    
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements: Counter = Counter()
+    
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+    
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Identical statements run at least ``threshold`` times (likely N+1)."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+# Set by the request middleware; the async engine runs its sync events in a
+# greenlet that shares the calling task's context, so they see this too
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def start_tracking():
+    """Begin counting statements for the current request. Returns (stats, reset token)."""
+    queries = RequestQueries()
+    return queries, _current.set(queries)
+
+
+def stop_tracking(token) -> None:
+    _current.reset(token)
+
+
+def attach(engine: Engine) -> None:
+    """Time every statement a (sync) engine executes into the active request."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(connection, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            connection.info.setdefault("query_started", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(connection, cursor, statement, parameters, context, executemany):
+        queries = _current.get()
+        started = connection.info.get("query_started")
+        if queries is None or not started:
+            return
+        queries.record(statement, time.perf_counter() - started.pop())
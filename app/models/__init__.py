@@ -2,5 +2,6 @@
 
 from .user import User
 from .reset_token import ResetToken
+from .refresh_token import RefreshToken
 
-__all__ = ["User", "ResetToken"] 
\ No newline at end of file
+__all__ = ["User", "ResetToken", "RefreshToken"] 
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Refresh token database model."""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.db import Base
+
+
+class RefreshToken(Base):
+    """Refresh token model. Only a SHA-256 digest of the token is stored."""
+    
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE", name="fk_refresh_tokens_user_id"),
+        index=True,
+        nullable=False
+    )
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Purge finds expired tokens by range
+    
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
@@ -1,6 +1,7 @@
 """Reset token database model."""
 
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, ForeignKey
+from sqlalchemy.orm import relationship
 from app.db import Base
 
 
@@ -10,12 +11,26 @@ class ResetToken(Base):
     __tablename__ = "reset_tokens"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE", name="fk_reset_tokens_user_id"),
+        index=True,
+        nullable=False
+    )
     token = Column(String(255), unique=True, index=True)  # Long token for URL-based reset
     verification_code = Column(String(10), index=True)  # Short code for form-based reset
     token_type = Column(String(20))  # 'password' or 'pin'
-    expires_at = Column(String(50))  # ISO format datetime string
+    expires_at = Column(DateTime, nullable=False)  # UTC
     used = Column(Boolean, default=False)
     
+    user = relationship("User", back_populates="reset_tokens")
+    
+    __table_args__ = (
+        # Covers live-token lookups: user + type + unused + not yet expired
+        Index("ix_reset_tokens_user_type_used_expires", "user_id", "token_type", "used", "expires_at"),
+        # Lets the background purge find used and expired tokens without a scan
+        Index("ix_reset_tokens_used_expires", "used", "expires_at"),
+    )
+    
     def __repr__(self):
         return f"<ResetToken(id={self.id}, user_id={self.user_id}, type='{self.token_type}', used={self.used})>" 
\ No newline at end of file
@@ -1,6 +1,7 @@
 """User database model."""
 
 from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy.orm import relationship
 from app.db import Base
 
 
@@ -16,6 +17,16 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=True)
     google_id = Column(String(50), unique=True, index=True, nullable=True)
     is_google_user = Column(Boolean, default=False)
+    token_version = Column(Integer, default=0, nullable=False)  # Bumped to revoke issued tokens
+    is_admin = Column(Boolean, default=False, nullable=False)  # Support staff access to /admin endpoints
+    
+    # Rows are removed by ON DELETE CASCADE, so the ORM never loads them to delete
+    reset_tokens = relationship(
+        "ResetToken",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>" 
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Pydantic schemas package."""
 
-from .user import UserCreate, UserOut, UserLogin, ChangePasswordRequest, GoogleAuthRequest, GoogleUser, PasswordVerifyRequest
-from .auth import Token, ForgotPasswordRequest, ResetPasswordRequest, ResetPasswordWithCodeRequest
+from .user import (
+    UserCreate, UserOut, UserLogin, ChangePasswordRequest, GoogleAuthRequest, GoogleUser, PasswordVerifyRequest,
+    AdminUserOut, UserPage
+)
+from .auth import Token, RefreshTokenRequest, ForgotPasswordRequest, ResetPasswordRequest, ResetPasswordWithCodeRequest
 from .pin import (
     PinCreate, PinVerify, PinVerifyResponse, PinRemove, 
     ChangePinRequest, ForgotPinRequest, ResetPinRequest, ResetPinWithCodeRequest
@@ -11,9 +14,9 @@ from .common import MessageResponse, HealthCheck
 __all__ = [
     # User schemas
     "UserCreate", "UserOut", "UserLogin", "ChangePasswordRequest", 
-    "GoogleAuthRequest", "GoogleUser", "PasswordVerifyRequest",
+    "GoogleAuthRequest", "GoogleUser", "PasswordVerifyRequest", "AdminUserOut", "UserPage",
     # Auth schemas
-    "Token", "ForgotPasswordRequest", "ResetPasswordRequest", "ResetPasswordWithCodeRequest",
+    "Token", "RefreshTokenRequest", "ForgotPasswordRequest", "ResetPasswordRequest", "ResetPasswordWithCodeRequest",
     # PIN schemas
     "PinCreate", "PinVerify", "PinVerifyResponse", "PinRemove", 
     "ChangePinRequest", "ForgotPinRequest", "ResetPinRequest", "ResetPinWithCodeRequest",
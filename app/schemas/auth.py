@@ -1,5 +1,6 @@
 """Authentication schemas."""
 
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 
@@ -7,6 +8,13 @@ class Token(BaseModel):
     """Schema for JWT token response."""
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for refreshing or revoking a refresh token."""
+    refresh_token: str
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -1,5 +1,6 @@
 """PIN management schemas."""
 
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 
@@ -11,12 +12,15 @@ class PinCreate(BaseModel):
 class PinVerify(BaseModel):
     """Schema for PIN verification."""
     pin: str
+    issue_token: bool = False
 
 
 class PinVerifyResponse(BaseModel):
     """Schema for PIN verification response."""
     valid: bool
     message: str
+    pin_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class PinRemove(BaseModel):
@@ -1,7 +1,7 @@
 """User schemas for request/response validation."""
 
 from pydantic import BaseModel, EmailStr
-from typing import Union
+from typing import Union, Optional
 
 
 class UserCreate(BaseModel):
@@ -21,6 +21,24 @@ class UserOut(BaseModel):
         from_attributes = True
 
 
+class AdminUserOut(BaseModel):
+    """Schema for a user row in admin listings (no credential hashes)."""
+    id: int
+    username: str
+    email: Optional[str] = None
+    is_google_user: bool = False
+    has_pin: bool = False
+    
+    class Config:
+        from_attributes = True
+
+
+class UserPage(BaseModel):
+    """Schema for one page of an admin user listing."""
+    items: list[AdminUserOut]
+    next_cursor: Optional[str] = None
+
+
 class UserLogin(BaseModel):
     """Schema for user login - accepts username or email."""
     username_or_email: str
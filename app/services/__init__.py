@@ -3,5 +3,11 @@
 from .email_service import EmailService
 from .user_service import UserService
 from .reset_service import ResetService
+from .token_service import TokenService
+from .async_user_service import AsyncUserService
+from .async_reset_service import AsyncResetService
 
-__all__ = ["EmailService", "UserService", "ResetService"] 
\ No newline at end of file
+__all__ = [
+    "EmailService", "UserService", "ResetService", "TokenService",
+    "AsyncUserService", "AsyncResetService"
+] 
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""Async reset service for password and PIN reset on an AsyncSession."""
+
+import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.db import use_primary
+from app.models import User, ResetToken
+from app.utils import generate_reset_token, generate_verification_code, get_password_hash_async, get_pin_hash_async, validate_password, validate_pin
+from app.services.email_service import EmailService
+from app.services.async_user_service import AsyncUserService
+from app.services.token_service import TokenService
+from app.services.statements import RESET_TOKEN_BY_TOKEN, RESET_TOKEN_BY_CODE, CONSUME_RESET_TOKEN
+
+
+class AsyncResetService:
+    """Async counterpart of ``ResetService`` used by the API endpoints."""
+    
+    @staticmethod
+    async def create_reset_token(db: AsyncSession, user_id: int, token_type: str) -> tuple[str, str]:
+        """Create a reset token in the database. Returns (token, verification_code)."""
+        token = generate_reset_token()
+        verification_code = generate_verification_code()
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        
+        reset_token = ResetToken(
+            user_id=user_id,
+            token=token,
+            verification_code=verification_code,
+            token_type=token_type,
+            expires_at=expires_at,
+            used=False
+        )
+        
+        db.add(reset_token)
+        await db.commit()
+        
+        return token, verification_code
+    
+    @staticmethod
+    async def verify_reset_token(db: AsyncSession, token: str, token_type: str) -> ResetToken:
+        """Verify and return the reset token if valid."""
+        result = await db.execute(RESET_TOKEN_BY_TOKEN, {
+            "token": token,
+            "token_type": token_type,
+            "now": datetime.datetime.utcnow()
+        })
+        return result.scalars().first()
+    
+    @staticmethod
+    async def verify_reset_code(db: AsyncSession, email: str, verification_code: str, token_type: str) -> ResetToken:
+        """Verify and return the reset token using verification code and email."""
+        # Token and user come back together in one joined query
+        result = await db.execute(RESET_TOKEN_BY_CODE, {
+            "email": email,
+            "verification_code": verification_code,
+            "token_type": token_type,
+            "now": datetime.datetime.utcnow()
+        })
+        return result.scalars().first()
+    
+    @staticmethod
+    async def consume_reset_token(db: AsyncSession, token_id: int, detail: str) -> None:
+        """Atomically mark a live reset token as used (not committed).
+        
+        The conditional UPDATE only matches an unused, unexpired token, so of
+        two concurrent submissions exactly one succeeds. Raises 400 otherwise.
+        """
+        result = await db.execute(CONSUME_RESET_TOKEN, {
+            "token_id": token_id,
+            "now": datetime.datetime.utcnow()
+        })
+        
+        if result.rowcount != 1:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=detail
+            )
+    
+    @staticmethod
+    def _get_reset_user(reset_token: ResetToken) -> User:
+        """Return the user a reset token belongs to (loaded with the token)."""
+        user = reset_token.user
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return user
+    
+    @staticmethod
+    async def request_password_reset(db: AsyncSession, email: str) -> str:
+        """Request password reset."""
+        user = await AsyncUserService.get_profile_by_email(db, email)
+        if not user:
+            # Don't reveal if email exists for security
+            return "If the email exists, a password reset code has been sent"
+        
+        # Check if user is a Google user
+        if user.is_google_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This account uses Google authentication. Please sign in with Google."
+            )
+        
+        # Generate reset token and verification code
+        token, verification_code = await AsyncResetService.create_reset_token(db, user.id, "password")
+        
+        # Send email with verification code
+        EmailService.send_reset_email(email, verification_code, "password")
+        
+        return "If the email exists, a password reset code has been sent"
+    
+    @staticmethod
+    async def reset_password(db: AsyncSession, token: str, new_password: str) -> str:
+        """Reset password using token (URL-based reset)."""
+        # Validate new password
+        is_valid, message = validate_password(new_password)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Tokens are consumed here, so read them from the primary
+        use_primary(db)
+        
+        # Verify reset token
+        reset_token = await AsyncResetService.verify_reset_token(db, token, "password")
+        if not reset_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token"
+            )
+        
+        # Get user and update password
+        user = AsyncResetService._get_reset_user(reset_token)
+        hashed_password = await get_password_hash_async(new_password)
+        
+        # Consume the token in the same transaction as the credential change
+        await AsyncResetService.consume_reset_token(db, reset_token.id, "Invalid or expired reset token")
+        user.hashed_password = hashed_password
+        # Revoke tokens issued before the reset
+        user.token_version = (user.token_version or 0) + 1
+        await TokenService.revoke_all_for_user(db, user.id)
+        
+        await db.commit()
+        
+        return "Password has been reset successfully"
+    
+    @staticmethod
+    async def reset_password_with_code(db: AsyncSession, email: str, verification_code: str, new_password: str) -> str:
+        """Reset password using verification code (form-based reset)."""
+        # Validate new password
+        is_valid, message = validate_password(new_password)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Tokens are consumed here, so read them from the primary
+        use_primary(db)
+        
+        # Verify reset code
+        reset_token = await AsyncResetService.verify_reset_code(db, email, verification_code, "password")
+        if not reset_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired verification code"
+            )
+        
+        # Get user and update password
+        user = AsyncResetService._get_reset_user(reset_token)
+        hashed_password = await get_password_hash_async(new_password)
+        
+        # Consume the token in the same transaction as the credential change
+        await AsyncResetService.consume_reset_token(db, reset_token.id, "Invalid or expired verification code")
+        user.hashed_password = hashed_password
+        # Revoke tokens issued before the reset
+        user.token_version = (user.token_version or 0) + 1
+        await TokenService.revoke_all_for_user(db, user.id)
+        
+        await db.commit()
+        
+        return "Password has been reset successfully"
+    
+    @staticmethod
+    async def request_pin_reset(db: AsyncSession, email: str) -> str:
+        """Request PIN reset."""
+        user = await AsyncUserService.get_profile_by_email(db, email)
+        if not user or not user.has_pin:
+            # Don't reveal if email exists or has PIN for security
+            return "If the email exists and has a PIN set, a PIN reset code has been sent"
+        
+        # Generate reset token and verification code
+        token, verification_code = await AsyncResetService.create_reset_token(db, user.id, "pin")
+        
+        # Send email with verification code
+        EmailService.send_reset_email(email, verification_code, "pin")
+        
+        return "If the email exists and has a PIN set, a PIN reset code has been sent"
+    
+    @staticmethod
+    async def reset_pin(db: AsyncSession, token: str, new_pin: str) -> str:
+        """Reset PIN using token (URL-based reset)."""
+        # Validate new PIN
+        is_valid, message = validate_pin(new_pin)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Tokens are consumed here, so read them from the primary
+        use_primary(db)
+        
+        # Verify reset token
+        reset_token = await AsyncResetService.verify_reset_token(db, token, "pin")
+        if not reset_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token"
+            )
+        
+        # Get user and update PIN
+        user = AsyncResetService._get_reset_user(reset_token)
+        hashed_pin = await get_pin_hash_async(new_pin)
+        
+        # Consume the token in the same transaction as the credential change
+        await AsyncResetService.consume_reset_token(db, reset_token.id, "Invalid or expired reset token")
+        user.hashed_pin = hashed_pin
+        
+        await db.commit()
+        
+        return "PIN has been reset successfully"
+    
+    @staticmethod
+    async def reset_pin_with_code(db: AsyncSession, email: str, verification_code: str, new_pin: str) -> str:
+        """Reset PIN using verification code (form-based reset)."""
+        # Validate new PIN
+        is_valid, message = validate_pin(new_pin)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Tokens are consumed here, so read them from the primary
+        use_primary(db)
+        
+        # Verify reset code
+        reset_token = await AsyncResetService.verify_reset_code(db, email, verification_code, "pin")
+        if not reset_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired verification code"
+            )
+        
+        # Get user and update PIN
+        user = AsyncResetService._get_reset_user(reset_token)
+        hashed_pin = await get_pin_hash_async(new_pin)
+        
+        # Consume the token in the same transaction as the credential change
+        await AsyncResetService.consume_reset_token(db, reset_token.id, "Invalid or expired verification code")
+        user.hashed_pin = hashed_pin
+        
+        await db.commit()
+        
+        return "PIN has been reset successfully"
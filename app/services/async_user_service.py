@@ -0,0 +1,319 @@
+"""Async user service for business logic on an AsyncSession."""
+
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.db import use_primary
+from app.models import User
+from app.schemas import UserCreate, GoogleUser
+from app.utils import (
+    get_password_hash_async, verify_password_async, validate_password,
+    get_pin_hash_async, verify_pin_async, validate_pin, verify_and_update_async
+)
+from app.services.email_service import EmailService
+from app.services.token_service import TokenService
+from app.services.user_service import duplicate_user_exception, user_page_query
+from app.services.statements import (
+    USER_BY_USERNAME, USER_BY_EMAIL, USER_BY_USERNAME_OR_EMAIL, USER_PIN_AND_VERSION, USER_PROFILE_BY_EMAIL
+)
+from app.services.user_cache import UserProfile, user_cache
+
+
+class AsyncUserService:
+    """Async counterpart of ``UserService`` used by the API endpoints."""
+    
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """Create a new user.
+        
+        Uniqueness is enforced by the username/email unique indexes, so
+        registration is a single INSERT instead of two lookups first.
+        """
+        use_primary(db)
+        
+        # Validate password
+        is_valid, message = validate_password(user_data.password)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Create user
+        hashed_password = await get_password_hash_async(user_data.password)
+        user = User(
+            username=user_data.username,
+            hashed_password=hashed_password,
+            email=user_data.email
+        )
+        
+        db.add(user)
+        try:
+            # The generated id comes back with the INSERT; no refresh needed
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            duplicate = duplicate_user_exception(e)
+            if duplicate is None:
+                raise
+            raise duplicate
+        
+        # Send welcome email
+        EmailService.send_welcome_email(user_data.email, user_data.username)
+        
+        return user
+    
+    @staticmethod
+    async def create_google_user(db: AsyncSession, google_user: GoogleUser, google_id: str = None) -> User:
+        """Create a user from Google OAuth."""
+        use_primary(db)
+        
+        # Check if user already exists (from the DB: the row's claims go into a token)
+        user = await AsyncUserService._load_user(db, USER_BY_EMAIL, {"email": google_user.email})
+        if user:
+            return user
+        
+        # Create new Google user
+        user = User(
+            username=google_user.email,
+            email=google_user.email,
+            google_id=google_id,
+            is_google_user=True
+        )
+        
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        
+        # Send welcome email
+        EmailService.send_welcome_email(user.email, user.username)
+        
+        return user
+    
+    @staticmethod
+    async def _load_user(db: AsyncSession, statement, params: dict) -> User:
+        """Run a user lookup and return the first match."""
+        result = await db.execute(statement, params)
+        return result.scalars().first()
+    
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> User:
+        """Get user by id."""
+        return await db.get(User, user_id)
+    
+    @staticmethod
+    async def get_user_for_auth(db: AsyncSession, user_id: int) -> User:
+        """Get user by id from the primary.
+        
+        Use wherever the row's hashes, ``token_version`` or ``is_admin``
+        decide access: a replica can lag behind a revocation.
+        """
+        use_primary(db)
+        return await db.get(User, user_id, populate_existing=True)
+    
+    @staticmethod
+    async def get_user_by_username(db: AsyncSession, username: str) -> User:
+        """Get user by username."""
+        return await AsyncUserService._load_user(db, USER_BY_USERNAME, {"username": username})
+    
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> User:
+        """Get user by email."""
+        return await AsyncUserService._load_user(db, USER_BY_EMAIL, {"email": email})
+    
+    @staticmethod
+    async def get_user_by_username_or_email(db: AsyncSession, username_or_email: str) -> User:
+        """Get user by username or email in one query, preferring a username match."""
+        return await AsyncUserService._load_user(db, USER_BY_USERNAME_OR_EMAIL, {"login": username_or_email})
+    
+    @staticmethod
+    async def get_profile_by_email(db: AsyncSession, email: str) -> Optional[UserProfile]:
+        """Get the non-secret profile of a user by email, read through the user cache.
+        
+        Serves the unauthenticated forgot-password/forgot-PIN lookups; anything
+        that checks credentials uses the full row instead.
+        """
+        if user_cache.enabled:
+            profile = await user_cache.get(email)
+            if profile is not None:
+                return profile
+        
+        result = await db.execute(USER_PROFILE_BY_EMAIL, {"email": email})
+        row = result.mappings().first()
+        profile = UserProfile(**row) if row is not None else None
+        if user_cache.enabled:
+            await user_cache.put(profile)
+        return profile
+    
+    @staticmethod
+    async def get_pin_and_version(db: AsyncSession, user_id: int):
+        """Return ``(has_pin, token_version)`` for a user, or None if the user no longer exists.
+        
+        Read from the primary so a PIN change or revocation moments ago shows up.
+        """
+        use_primary(db)
+        result = await db.execute(USER_PIN_AND_VERSION, {"user_id": user_id})
+        return result.first()
+    
+    @staticmethod
+    async def list_users(db: AsyncSession, limit: int, after=None, prefix: str = None, field: str = "username") -> list:
+        """Return one keyset page of user rows (see ``user_page_query``)."""
+        result = await db.execute(user_page_query(limit, after, prefix, field))
+        return result.mappings().all()
+    
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username_or_email: str, password: str) -> User:
+        """Authenticate user with username/email and password."""
+        # Credentials are always checked against the database, never the cache
+        result = await db.execute(USER_BY_USERNAME_OR_EMAIL, {"login": username_or_email})
+        user = result.scalars().first()
+        if not user or not user.hashed_password:
+            return None
+        is_valid, new_hash = await verify_and_update_async(password, user.hashed_password)
+        if not is_valid:
+            return None
+        
+        # Upgrade outdated hashes (old scheme or cost) while we have the plaintext
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+        return user
+    
+    @staticmethod
+    async def change_password(db: AsyncSession, user: User, current_password: str, new_password: str) -> None:
+        """Change user password."""
+        # Check if user is Google user
+        if user.is_google_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This account uses Google authentication. Password cannot be changed."
+            )
+        
+        # Verify current password
+        if not await verify_password_async(current_password, user.hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Current password is incorrect"
+            )
+        
+        # Validate new password
+        is_valid, message = validate_password(new_password)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        # Update password and revoke every token issued before the change
+        user.hashed_password = await get_password_hash_async(new_password)
+        user.token_version = (user.token_version or 0) + 1
+        await TokenService.revoke_all_for_user(db, user.id)
+        await db.commit()
+    
+    @staticmethod
+    async def set_pin(db: AsyncSession, user: User, pin: str) -> None:
+        """Set user PIN."""
+        # Validate PIN
+        is_valid, message = validate_pin(pin)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        user.hashed_pin = await get_pin_hash_async(pin)
+        await db.commit()
+    
+    @staticmethod
+    async def verify_user_pin(db: AsyncSession, user: User, pin: str) -> bool:
+        """Verify user PIN, upgrading its hash if it is outdated."""
+        if not user.hashed_pin:
+            return False
+        
+        is_valid, new_hash = await verify_and_update_async(pin, user.hashed_pin)
+        if is_valid and new_hash:
+            user.hashed_pin = new_hash
+            await db.commit()
+        return is_valid
+    
+    @staticmethod
+    async def change_pin(db: AsyncSession, user: User, current_pin: str, new_pin: str) -> None:
+        """Change user PIN."""
+        if not user.hashed_pin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No PIN set for this user"
+            )
+        
+        # Verify current PIN
+        if not await verify_pin_async(current_pin, user.hashed_pin):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Current PIN is incorrect"
+            )
+        
+        # Validate new PIN
+        is_valid, message = validate_pin(new_pin)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+        
+        user.hashed_pin = await get_pin_hash_async(new_pin)
+        await db.commit()
+    
+    @staticmethod
+    async def remove_pin(db: AsyncSession, user: User, current_pin: str) -> None:
+        """Remove user PIN."""
+        if not user.hashed_pin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No PIN set for this user"
+            )
+        
+        if not await verify_pin_async(current_pin, user.hashed_pin):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid PIN"
+            )
+        
+        user.hashed_pin = None
+        await db.commit()
+    
+    @staticmethod
+    async def force_remove_pin(db: AsyncSession, user: User, password: str) -> None:
+        """Remove user PIN after verifying the account password (for forgotten PIN)."""
+        # Check if user is Google user
+        if user.is_google_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This account uses Google authentication. Password verification is not available."
+            )
+        
+        # Check if user has a PIN to remove
+        if not user.hashed_pin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No PIN set for this user"
+            )
+        
+        # Verify password
+        if not user.hashed_password or not await verify_password_async(password, user.hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid password"
+            )
+        
+        user.hashed_pin = None
+        await db.commit()
+    
+    @staticmethod
+    async def delete_user(db: AsyncSession, user: User) -> None:
+        """Delete user account."""
+        # Reset and refresh tokens go with it via ON DELETE CASCADE
+        await db.delete(user)
+        await db.commit()
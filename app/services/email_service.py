@@ -1,11 +1,16 @@
 """Email service using Resend for sending emails."""
 
-import resend
+from functools import lru_cache
 from app.core.config import settings
 
-# Initialize Resend
-if settings.resend_api_key:
-    resend.api_key = settings.resend_api_key
+
+@lru_cache(maxsize=None)
+def _resend():
+    """Import and configure the Resend client on first send."""
+    import resend
+    if settings.resend_api_key:
+        resend.api_key = settings.resend_api_key
+    return resend
 
 
 class EmailService:
@@ -72,7 +77,7 @@ class EmailService:
                 "html": html_content,
             }
             
-            response = resend.Emails.send(params)
+            response = _resend().Emails.send(params)
             print(f"Welcome email sent successfully to {email}. ID: {response.get('id')}")
             return True
             
@@ -157,7 +162,7 @@ class EmailService:
                 "html": html_content,
             }
             
-            response = resend.Emails.send(params)
+            response = _resend().Emails.send(params)
             print(f"Reset email sent successfully to {email}. ID: {response.get('id')}")
             return True
             
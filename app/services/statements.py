@@ -0,0 +1,70 @@
+"""Pre-built statements for hot-path lookups.
+
+Each statement is constructed once at import with named bind parameters,
+so per-request work is only binding values: the statement's cache key is
+stable and SQLAlchemy's compiled cache serves the SQL string instead of
+recompiling it.
+"""
+
+from sqlalchemy import select, update, bindparam, or_, case
+from sqlalchemy.orm import joinedload, contains_eager
+
+from app.models import User, ResetToken, RefreshToken
+
+# Users: params username / email / login
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+# A few columns of one row, for endpoints that otherwise work from token claims
+USER_PIN_AND_VERSION = select(
+    User.hashed_pin.isnot(None).label("has_pin"), User.token_version
+).where(User.id == bindparam("user_id"))
+
+# Cacheable profile columns (see UserProfile); no secrets
+USER_PROFILE_BY_EMAIL = select(
+    User.id, User.username, User.email, User.is_google_user,
+    User.hashed_pin.isnot(None).label("has_pin")
+).where(User.email == bindparam("email"))
+
+# Single-statement lookup on the username and email indexes, preferring a username match
+USER_BY_USERNAME_OR_EMAIL = select(User).where(
+    or_(User.username == bindparam("login"), User.email == bindparam("login"))
+).order_by(
+    case((User.username == bindparam("login"), 0), else_=1)
+).limit(1)
+
+# Reset tokens: live (unused, unexpired at :now) tokens, loaded with their user
+RESET_TOKEN_BY_TOKEN = select(ResetToken).options(
+    joinedload(ResetToken.user)
+).where(
+    ResetToken.token == bindparam("token"),
+    ResetToken.token_type == bindparam("token_type"),
+    ResetToken.used == False,
+    ResetToken.expires_at > bindparam("now")
+)
+
+RESET_TOKEN_BY_CODE = select(ResetToken).join(ResetToken.user).options(
+    contains_eager(ResetToken.user)
+).where(
+    User.email == bindparam("email"),
+    ResetToken.verification_code == bindparam("verification_code"),
+    ResetToken.token_type == bindparam("token_type"),
+    ResetToken.used == False,
+    ResetToken.expires_at > bindparam("now")
+)
+
+# Conditional consume: matches only while the token is still live
+CONSUME_RESET_TOKEN = update(ResetToken).where(
+    ResetToken.id == bindparam("token_id"),
+    ResetToken.used == False,
+    ResetToken.expires_at > bindparam("now")
+).values(used=True).execution_options(synchronize_session=False)
+
+# Refresh tokens: live token id together with its user
+REFRESH_TOKEN_WITH_USER = select(RefreshToken.id, User).join(
+    User, User.id == RefreshToken.user_id
+).where(
+    RefreshToken.token_hash == bindparam("token_hash"),
+    RefreshToken.expires_at > bindparam("now")
+)
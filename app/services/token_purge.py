@@ -0,0 +1,140 @@
+"""Background purge of dead reset and refresh tokens."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import async_engine
+
+logger = logging.getLogger(__name__)
+
+# MySQL named lock so only one worker across the fleet purges at a time
+PURGE_LOCK_NAME = "childsafe_token_purge"
+
+# (table, statement) pairs. Each statement is a range on one index: used
+# reset tokens on the (used, expires_at) prefix, expired ones on its range,
+# expired refresh tokens on expires_at; an OR across them would scan
+PURGE_STATEMENTS = [
+    ("reset_tokens", text("""
+        DELETE FROM reset_tokens
+        WHERE used = 1
+        LIMIT :batch_size
+    """)),
+    ("reset_tokens", text("""
+        DELETE FROM reset_tokens
+        WHERE used = 0 AND expires_at < UTC_TIMESTAMP()
+        LIMIT :batch_size
+    """)),
+    ("refresh_tokens", text("""
+        DELETE FROM refresh_tokens
+        WHERE expires_at < UTC_TIMESTAMP()
+        LIMIT :batch_size
+    """)),
+]
+
+# SQLite has no DELETE ... LIMIT or UTC_TIMESTAMP(), so select each chunk by id
+SQLITE_PURGE_STATEMENTS = [
+    ("reset_tokens", text("""
+        DELETE FROM reset_tokens WHERE id IN (
+            SELECT id FROM reset_tokens
+            WHERE used = 1
+            LIMIT :batch_size
+        )
+    """)),
+    ("reset_tokens", text("""
+        DELETE FROM reset_tokens WHERE id IN (
+            SELECT id FROM reset_tokens
+            WHERE used = 0 AND expires_at < datetime('now')
+            LIMIT :batch_size
+        )
+    """)),
+    ("refresh_tokens", text("""
+        DELETE FROM refresh_tokens WHERE id IN (
+            SELECT id FROM refresh_tokens
+            WHERE expires_at < datetime('now')
+            LIMIT :batch_size
+        )
+    """)),
+]
+
+
+class TokenPurgeTask:
+    """Periodic in-process purge that deletes dead tokens in small chunks."""
+    
+    def __init__(self, interval_seconds: int, batch_size: int, pause_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self._task: Optional[asyncio.Task] = None
+    
+    async def purge_once(self) -> dict:
+        """Run one purge pass. Returns rows deleted per table, or {} if another worker holds the lock."""
+        deleted = {}
+        async with async_engine.connect() as connection:
+            # A SQLite database is local to one host; there is no fleet to coordinate
+            is_mysql = connection.dialect.name == "mysql"
+            statements = PURGE_STATEMENTS if is_mysql else SQLITE_PURGE_STATEMENTS
+            if is_mysql:
+                acquired = (await connection.execute(
+                    text("SELECT GET_LOCK(:name, 0)"), {"name": PURGE_LOCK_NAME}
+                )).scalar()
+                if not acquired:
+                    logger.info("Token purge skipped, another worker holds the lock")
+                    return deleted
+            
+            try:
+                for table, statement in statements:
+                    deleted.setdefault(table, 0)
+                    while True:
+                        result = await connection.execute(statement, {"batch_size": self.batch_size})
+                        await connection.commit()
+                        deleted[table] += result.rowcount
+                        if result.rowcount < self.batch_size:
+                            break
+                        # Leave room for foreground queries between chunks
+                        await asyncio.sleep(self.pause_seconds)
+            finally:
+                if is_mysql:
+                    await connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": PURGE_LOCK_NAME})
+                    await connection.commit()
+        
+        logger.info(f"Token purge removed {deleted}")
+        return deleted
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.purge_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Token purge failed: {str(e)}")
+    
+    def start(self) -> None:
+        """Start the periodic purge on the running event loop."""
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Cancel the periodic purge."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Global purge task instance
+token_purge_task = TokenPurgeTask(
+    settings.token_purge_interval_seconds,
+    settings.token_purge_batch_size,
+    settings.token_purge_pause_seconds,
+)
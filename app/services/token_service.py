@@ -0,0 +1,96 @@
+"""Token service for access and refresh token issuance."""
+
+import datetime
+import hashlib
+import secrets
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.db import use_primary
+from app.models import User, RefreshToken
+from app.schemas import Token
+from app.utils.jwt import create_user_access_token
+from app.services.statements import REFRESH_TOKEN_WITH_USER
+
+
+class TokenService:
+    """Service class for token-related operations."""
+    
+    @staticmethod
+    def _digest(refresh_token: str) -> str:
+        """Return the stored form of a refresh token."""
+        return hashlib.sha256(refresh_token.encode()).hexdigest()
+    
+    @staticmethod
+    def create_refresh_token(db: AsyncSession, user_id: int) -> str:
+        """Create a refresh token in the database (not committed)."""
+        refresh_token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            user_id=user_id,
+            token_hash=TokenService._digest(refresh_token),
+            expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=settings.refresh_token_expire_days)
+        ))
+        return refresh_token
+    
+    @staticmethod
+    async def issue_tokens(db: AsyncSession, user: User) -> Token:
+        """Issue an access token and a new refresh token for a user."""
+        # Sign before committing so the expired user row isn't reloaded
+        access_token = create_user_access_token(user)
+        refresh_token = TokenService.create_refresh_token(db, user.id)
+        await db.commit()
+        
+        return Token(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=refresh_token,
+            expires_in=settings.access_token_expire_minutes * 60
+        )
+    
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str) -> Token:
+        """Exchange a refresh token for a new token pair, rotating the refresh token."""
+        invalid_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+        
+        # Rotation is read-modify-write; a lagging replica may not have the token yet
+        use_primary(db)
+        
+        # One indexed lookup for both the token and its user
+        result = await db.execute(REFRESH_TOKEN_WITH_USER, {
+            "token_hash": TokenService._digest(refresh_token),
+            "now": datetime.datetime.utcnow()
+        })
+        row = result.first()
+        
+        if not row:
+            raise invalid_exception
+        
+        token_id, user = row
+        
+        # Consume the old token; a concurrent refresh with the same token loses
+        consumed = await db.execute(
+            delete(RefreshToken).where(RefreshToken.id == token_id)
+        )
+        if not consumed.rowcount:
+            await db.rollback()
+            raise invalid_exception
+        
+        return await TokenService.issue_tokens(db, user)
+    
+    @staticmethod
+    async def revoke(db: AsyncSession, refresh_token: str) -> None:
+        """Revoke a single refresh token."""
+        await db.execute(
+            delete(RefreshToken).where(RefreshToken.token_hash == TokenService._digest(refresh_token))
+        )
+        await db.commit()
+    
+    @staticmethod
+    async def revoke_all_for_user(db: AsyncSession, user_id: int) -> None:
+        """Revoke every refresh token of a user (not committed)."""
+        await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
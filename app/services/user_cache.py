@@ -0,0 +1,252 @@
+"""Read-through cache of non-secret user profile fields, keyed by email."""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """Profile fields of a user; never hashes, token versions or admin flags.
+    
+    Anything that decides access loads the full row from the primary
+    instead (``AsyncUserService.get_user_for_auth``).
+    """
+    id: int
+    username: str
+    email: Optional[str]
+    is_google_user: bool = False
+    has_pin: bool = False
+
+
+class LocalUserCacheBackend:
+    """Bounded, TTL-aware LRU in this process.
+    
+    Also stands in for the shared backend in development and tests.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+    
+    async def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, row = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return row
+    
+    async def set(self, key: str, row: dict, ttl_seconds: int) -> None:
+        expires_at = time.time() + ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, row)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    async def delete(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisUserCacheBackend:
+    """Shared cache in Redis so an invalidation reaches every worker.
+    
+    Uses the asyncio client, so a slow Redis never blocks the event loop.
+    Redis errors are logged and treated as misses, so an outage only costs
+    the database lookups the cache would have saved. Expiry and eviction
+    are left to Redis (``maxmemory-policy``), so ``evictions`` stays 0.
+    """
+    
+    def __init__(self, url: str, prefix: str = "childsafe:user:"):
+        # Optional dependency, only needed when USER_CACHE_BACKEND=redis
+        import redis.asyncio
+        self._client = redis.asyncio.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._prefix = prefix
+        self.evictions = 0
+    
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            value = await self._client.get(self._prefix + key)
+        except Exception as e:
+            logger.warning(f"User cache get failed: {str(e)}")
+            return None
+        return json.loads(value) if value else None
+    
+    async def set(self, key: str, row: dict, ttl_seconds: int) -> None:
+        try:
+            await self._client.set(self._prefix + key, json.dumps(row), ex=ttl_seconds)
+        except Exception as e:
+            logger.warning(f"User cache set failed: {str(e)}")
+    
+    async def delete(self, keys: list[str]) -> None:
+        try:
+            await self._client.delete(*[self._prefix + key for key in keys])
+        except Exception as e:
+            # A failed invalidation leaves the entry until its TTL runs out
+            logger.error(f"User cache invalidation failed: {str(e)}")
+    
+    async def clear(self) -> None:
+        try:
+            async for key in self._client.scan_iter(f"{self._prefix}*"):
+                await self._client.delete(key)
+        except Exception as e:
+            logger.warning(f"User cache clear failed: {str(e)}")
+    
+    def size(self) -> int:
+        return -1
+
+
+class UserCache:
+    """Profiles of users looked up by email (forgot-password and forgot-PIN).
+    
+    Only ``UserProfile`` fields are stored, so nothing secret reaches a
+    shared backend. Any session that commits a change to (or deletes) a
+    user drops its entry, under the old email too if it changed, so every
+    mutation path invalidates without calling the cache itself. Entries
+    also expire after ``ttl_seconds``, which bounds staleness for writes
+    outside the ORM (e.g. manual SQL) and, with the local backend, in other
+    workers.
+    """
+    
+    def __init__(self, backend, ttl_seconds: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self._enabled and self.ttl_seconds > 0
+    
+    @staticmethod
+    def keys_for(user: User) -> list[str]:
+        """Cache keys a user may be stored under: its email, before and after this flush."""
+        emails = {user.email}
+        emails.update(inspect(user).attrs.email.history.deleted or ())
+        return [f"email:{email}" for email in emails if email]
+    
+    async def get(self, email: str) -> Optional[UserProfile]:
+        """Return the cached profile for an email, or None."""
+        row = await self.backend.get(f"email:{email}")
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return UserProfile(**row) if row is not None else None
+    
+    async def put(self, profile: Optional[UserProfile]) -> None:
+        """Cache a profile loaded from the database."""
+        if profile is None or not profile.email:
+            return
+        await self.backend.set(f"email:{profile.email}", asdict(profile), self.ttl_seconds)
+    
+    async def invalidate_keys(self, keys: Iterable[str]) -> None:
+        """Drop cache entries (call once the change is committed)."""
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return
+        await self.backend.delete(keys)
+        with self._lock:
+            self.invalidations += 1
+    
+    async def clear(self) -> None:
+        await self.backend.clear()
+    
+    def stats(self) -> dict:
+        """Return hit ratio, evictions and invalidations."""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.backend.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def build_user_cache() -> UserCache:
+    """Build the user cache from settings."""
+    if settings.user_cache_backend == "redis" and settings.user_cache_redis_url:
+        backend = RedisUserCacheBackend(settings.user_cache_redis_url)
+        return UserCache(backend, settings.user_cache_ttl_seconds)
+    backend = LocalUserCacheBackend(settings.user_cache_size)
+    return UserCache(backend, settings.user_cache_ttl_seconds, enabled=settings.user_cache_size > 0)
+
+
+# Global user cache instance
+user_cache = build_user_cache()
+
+# Invalidation tasks scheduled from session events, kept until done
+_pending_invalidations: set = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """Remember the keys of users this flush updated or deleted."""
+    if not user_cache.enabled:
+        return
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault("user_cache_keys", set()).update(user_cache.keys_for(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    keys = session.info.pop("user_cache_keys", None)
+    if not keys:
+        return
+    # Session events are synchronous; hand the delete to the running loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync scripts have no loop; their entries age out after the TTL
+        logger.info(f"User cache invalidation of {len(keys)} key(s) left to the TTL (no event loop)")
+        return
+    task = loop.create_task(user_cache.invalidate_keys(keys))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_users(session):
+    session.info.pop("user_cache_keys", None)
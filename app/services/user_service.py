@@ -1,222 +1,171 @@
-"""User service for business logic and database operations."""
+"""User queries on a sync Session, for scripts (bulk import/export, benchmarks).
 
-import datetime
+The account flows served by the API live in ``AsyncUserService``; the
+query builders and error mapping here are shared with it.
+"""
+
+import re
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.models import User, ResetToken
-from app.schemas import UserCreate, GoogleUser
-from app.utils import (
-    get_password_hash, verify_password, validate_password,
-    get_pin_hash, verify_pin, validate_pin, generate_reset_token
-)
-from app.services.email_service import EmailService
+from app.models import User
+from app.services.statements import USER_BY_USERNAME, USER_BY_EMAIL, USER_BY_USERNAME_OR_EMAIL
 
 
-class UserService:
-    """Service class for user-related operations."""
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def user_page_query(limit: int, after=None, prefix: str = None, field: str = "username"):
+    """Build one keyset page of users, projecting only non-secret columns.
     
-    @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
-        """Create a new user."""
-        # Check if username already exists
-        if UserService.get_user_by_username(db, user_data.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered"
-            )
-        
-        # Check if email already exists
-        if UserService.get_user_by_email(db, user_data.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        
-        # Validate password
-        is_valid, message = validate_password(user_data.password)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=message
-            )
-        
-        # Create user
-        hashed_password = get_password_hash(user_data.password)
-        user = User(
-            username=user_data.username,
-            hashed_password=hashed_password,
-            email=user_data.email
-        )
-        
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        
-        # Send welcome email
-        EmailService.send_welcome_email(user.email, user.username)
-        
-        return user
+    Without ``prefix`` pages walk the primary key (``id > after``). With a
+    prefix they walk the searched unique index instead (``field > after``
+    with ``field LIKE 'prefix%'``), so every page is an index range scan
+    that costs the same no matter how deep it is.
+    """
+    statement = select(
+        User.id, User.username, User.email, User.is_google_user,
+        User.hashed_pin.isnot(None).label("has_pin")
+    )
     
-    @staticmethod
-    def create_google_user(db: Session, google_user: GoogleUser, google_id: str = None) -> User:
-        """Create a user from Google OAuth."""
-        # Check if user already exists
-        user = UserService.get_user_by_email(db, google_user.email)
-        if user:
-            return user
-        
-        # Create new Google user
-        user = User(
-            username=google_user.email,
-            email=google_user.email,
-            google_id=google_id,
-            is_google_user=True
-        )
-        
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        
-        # Send welcome email
-        EmailService.send_welcome_email(user.email, user.username)
-        
-        return user
+    if prefix:
+        column = User.email if field == "email" else User.username
+        statement = statement.where(column.like(f"{escape_like(prefix)}%", escape="\\"))
+    else:
+        column = User.id
+    
+    if after is not None:
+        statement = statement.where(column > after)
+    
+    return statement.order_by(column).limit(limit)
+
+
+# Unique keys on users as they appear in driver errors: MySQL names the
+# index ("... for key 'users.ix_users_email'"), SQLite the column
+# ("UNIQUE constraint failed: users.email")
+_DUPLICATE_USER_DETAILS = {
+    "ix_users_username": "Username already registered",
+    "ix_users_email": "Email already registered",
+    "users.username": "Username already registered",
+    "users.email": "Email already registered",
+}
+_MYSQL_DUPLICATE_KEY = re.compile(r"for key '(?:users\.)?(\w+)'\W*$")
+_SQLITE_UNIQUE_FAILED = re.compile(r"UNIQUE constraint failed: ([\w.]+)")
+
+
+def duplicate_user_exception(error: IntegrityError) -> Optional[HTTPException]:
+    """Map a username/email unique-key violation to the registration error.
+    
+    Matches on the violated key, never the message as a whole (it echoes
+    the duplicate value). Returns None for any other integrity error,
+    which the caller re-raises unchanged.
+    """
+    message = str(error.orig)
+    match = _MYSQL_DUPLICATE_KEY.search(message) or _SQLITE_UNIQUE_FAILED.search(message)
+    detail = _DUPLICATE_USER_DETAILS.get(match.group(1)) if match else None
+    if detail is None:
+        return None
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class UserService:
+    """Sync user lookups and bulk operations."""
     
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> User:
         """Get user by username."""
-        return db.query(User).filter(User.username == username).first()
+        return db.execute(USER_BY_USERNAME, {"username": username}).scalars().first()
     
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> User:
         """Get user by email."""
-        return db.query(User).filter(User.email == email).first()
+        return db.execute(USER_BY_EMAIL, {"email": email}).scalars().first()
     
     @staticmethod
     def get_user_by_username_or_email(db: Session, username_or_email: str) -> User:
-        """Get user by username or email."""
-        # Try to find by username first
-        user = db.query(User).filter(User.username == username_or_email).first()
-        
-        # If not found, try by email
-        if not user:
-            user = db.query(User).filter(User.email == username_or_email).first()
-        
-        return user
-    
-    @staticmethod
-    def authenticate_user(db: Session, username_or_email: str, password: str) -> User:
-        """Authenticate user with username/email and password."""
-        user = UserService.get_user_by_username_or_email(db, username_or_email)
-        if not user or not user.hashed_password:
-            return None
-        if not verify_password(password, user.hashed_password):
-            return None
-        return user
+        """Get user by username or email in one query, preferring a username match."""
+        return db.execute(USER_BY_USERNAME_OR_EMAIL, {"login": username_or_email}).scalars().first()
     
     @staticmethod
-    def change_password(db: Session, user: User, current_password: str, new_password: str) -> None:
-        """Change user password."""
-        # Check if user is Google user
-        if user.is_google_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="This account uses Google authentication. Password cannot be changed."
-            )
-        
-        # Verify current password
-        if not verify_password(current_password, user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current password is incorrect"
-            )
-        
-        # Validate new password
-        is_valid, message = validate_password(new_password)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=message
-            )
-        
-        # Update password
-        user.hashed_password = get_password_hash(new_password)
-        db.commit()
+    def find_existing_users(db: Session, usernames: Iterable[str], emails: Iterable[str]) -> tuple[set, set]:
+        """Return the subsets of ``usernames`` and ``emails`` already registered (two indexed IN lookups)."""
+        usernames = list(usernames)
+        emails = [email for email in emails if email]
+        existing_usernames = set(db.execute(
+            select(User.username).where(User.username.in_(usernames))
+        ).scalars()) if usernames else set()
+        existing_emails = set(db.execute(
+            select(User.email).where(User.email.in_(emails))
+        ).scalars()) if emails else set()
+        return existing_usernames, existing_emails
     
     @staticmethod
-    def set_pin(db: Session, user: User, pin: str) -> None:
-        """Set user PIN."""
-        # Validate PIN
-        is_valid, message = validate_pin(pin)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=message
-            )
-        
-        user.hashed_pin = get_pin_hash(pin)
+    def bulk_insert_users(db: Session, rows: list[dict]) -> list[dict]:
+        """Insert already-hashed user rows as one multi-row INSERT and commit.
+        
+        Rows that collide with an existing username or email are skipped
+        rather than failing the batch; any other error (e.g. a value too
+        long for its column) still fails it. Returns the rows that were
+        actually inserted.
+        """
+        if not rows:
+            return []
+        table = User.__table__
+        # Skip only unique-key conflicts: MySQL's INSERT IGNORE would also
+        # turn data errors into warnings and silently truncate values
+        dialect = db.get_bind().dialect.name
+        if dialect == "mysql":
+            statement = mysql_insert(table).on_duplicate_key_update(id=table.c.id)
+        elif dialect == "sqlite":
+            statement = sqlite_insert(table).on_conflict_do_nothing()
+        else:
+            statement = insert(table)
+        # Core insert on the table: a plain executemany the driver folds into multi-row VALUES
+        db.execute(statement, [
+            {
+                "username": row["username"],
+                "email": row.get("email") or None,
+                "hashed_password": row.get("hashed_password"),
+                "hashed_pin": row.get("hashed_pin"),
+                "is_google_user": False,
+                "token_version": 0,
+            }
+            for row in rows
+        ])
         db.commit()
-    
-    @staticmethod
-    def verify_user_pin(user: User, pin: str) -> bool:
-        """Verify user PIN."""
-        if not user.hashed_pin:
-            return False
         
-        return verify_pin(pin, user.hashed_pin)
+        # rowcount can't tell which rows were skipped (and MySQL counts a
+        # no-op duplicate update as found), so match the salted hashes back
+        stored = dict(db.execute(
+            select(User.username, User.hashed_password).where(User.username.in_([row["username"] for row in rows]))
+        ).all())
+        return [row for row in rows if stored.get(row["username"]) == row.get("hashed_password")]
     
     @staticmethod
-    def change_pin(db: Session, user: User, current_pin: str, new_pin: str) -> None:
-        """Change user PIN."""
-        if not user.hashed_pin:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No PIN set for this user"
-            )
-        
-        # Verify current PIN
-        if not verify_pin(current_pin, user.hashed_pin):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current PIN is incorrect"
-            )
-        
-        # Validate new PIN
-        is_valid, message = validate_pin(new_pin)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=message
-            )
-        
-        user.hashed_pin = get_pin_hash(new_pin)
-        db.commit()
-    
-    @staticmethod
-    def remove_pin(db: Session, user: User, current_pin: str) -> None:
-        """Remove user PIN."""
-        if not user.hashed_pin:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No PIN set for this user"
-            )
-        
-        if not verify_pin(current_pin, user.hashed_pin):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid PIN"
-            )
-        
-        user.hashed_pin = None
-        db.commit()
-    
-    @staticmethod
-    def delete_user(db: Session, user: User) -> None:
-        """Delete user account."""
-        # Delete all reset tokens for this user
-        db.query(ResetToken).filter(ResetToken.user_id == user.id).delete()
-        
-        # Delete user
-        db.delete(user)
-        db.commit() 
\ No newline at end of file
+    def stream_users(db: Session, batch_size: int = 1000, include_hashes: bool = False) -> Iterator[dict]:
+        """Yield every user as a plain dict, reading through a server-side cursor.
+        
+        Rows are fetched ``batch_size`` at a time, so memory stays flat no
+        matter how many accounts are exported.
+        """
+        columns = [User.id, User.username, User.email, User.is_google_user, User.google_id]
+        if include_hashes:
+            columns += [User.hashed_password, User.hashed_pin]
+        else:
+            columns.append(User.hashed_pin.isnot(None).label("has_pin"))
+        
+        result = db.execute(
+            select(*columns).order_by(User.id).execution_options(stream_results=True, yield_per=batch_size)
+        )
+        try:
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            result.close()
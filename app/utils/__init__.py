@@ -2,12 +2,16 @@
 
 from .security import (
     get_password_hash, verify_password, get_pin_hash, verify_pin,
+    get_password_hash_async, verify_password_async, get_pin_hash_async, verify_pin_async,
+    verify_and_update, verify_and_update_async, is_known_hash,
     validate_password, validate_pin, generate_reset_token, generate_verification_code
 )
-from .jwt import create_access_token, verify_token
+from .jwt import create_access_token, create_user_access_token, create_pin_token, verify_token
 
 __all__ = [
     "get_password_hash", "verify_password", "get_pin_hash", "verify_pin",
+    "get_password_hash_async", "verify_password_async", "get_pin_hash_async", "verify_pin_async",
+    "verify_and_update", "verify_and_update_async", "is_known_hash",
     "validate_password", "validate_pin", "generate_reset_token", "generate_verification_code",
-    "create_access_token", "verify_token"
+    "create_access_token", "create_user_access_token", "create_pin_token", "verify_token"
 ] 
\ No newline at end of file
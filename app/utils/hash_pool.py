@@ -0,0 +1,139 @@
+"""Process pool for CPU-bound password and PIN hashing."""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HashPoolSaturated(Exception):
+    """Raised when the hashing queue is over budget and a request is shed."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+def _run_timed(func: Callable, submitted_at: float, *args):
+    """Run a hashing function in a worker and report queue and run time."""
+    started_at = time.time()
+    result = func(*args)
+    return max(0.0, started_at - submitted_at), time.time() - started_at, result
+
+
+class HashPool:
+    """Bounded process pool that keeps bcrypt work off the event loop.
+
+    At most ``max_workers + max_queue`` tasks are admitted at once; anything
+    beyond that is rejected immediately with ``HashPoolSaturated`` so cheap
+    routes keep their share of the worker.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 0):
+        self.max_workers = max_workers if max_workers and max_workers > 0 else (os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_run = 0.0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the executor on first use so importing this module stays cheap."""
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting hash pool with {self.max_workers} worker(s)")
+                # Never fork: the server already runs event-loop and DB driver
+                # threads, and forking a threaded process can deadlock a worker
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method)
+                )
+            return self._executor
+
+    def retry_after(self) -> int:
+        """Estimate in seconds how long until the queue drains."""
+        avg_run = self._total_run / self._completed if self._completed else 0.25
+        backlog = self._in_flight / self.max_workers
+        return max(1, math.ceil(avg_run * backlog))
+
+    async def run(self, func: Callable, *args):
+        """Run ``func(*args)`` in the pool and return its result."""
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise HashPoolSaturated(self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        self._admitted += 1
+        self._in_flight += 1
+        try:
+            waited, elapsed, result = await loop.run_in_executor(
+                executor, _run_timed, func, time.time(), *args
+            )
+        except BrokenProcessPool:
+            # A worker died; drop the executor so the next call starts a fresh one
+            logger.error("Hash pool worker died, restarting pool")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            self._failed += 1
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        self._completed += 1
+        self._total_run += elapsed
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return result
+
+    def stats(self) -> dict:
+        """Return admission, queue depth and wait-time statistics."""
+        completed = self._completed
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "started": self._executor is not None,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.max_workers),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "completed": completed,
+            "failed": self._failed,
+            "avg_wait_ms": round(self._total_wait / completed * 1000, 3) if completed else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 3),
+            "avg_run_ms": round(self._total_run / completed * 1000, 3) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global hash pool instance
+hash_pool = HashPool(settings.hash_pool_workers, settings.hash_pool_max_queue)
@@ -1,29 +1,184 @@
 """JWT token utilities."""
 
 import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
-from jose import JWTError, jwt
 from app.core.config import settings
+from app.utils.keyring import get_keyring, uses_asymmetric_keys
+
+
+class TokenCache:
+    """Bounded, TTL-aware LRU of verified token payloads.
+    
+    Keys are SHA-256 digests of the raw token so tokens are never held in
+    memory as-is. Entries expire after ``ttl_seconds`` or at the token's own
+    ``exp`` claim, whichever comes first. Only successfully verified tokens
+    are cached.
+    """
+    
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload for a token, or None."""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, payload = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+    
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a verified payload."""
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Return cache size and hit ratio."""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# Global verified token cache
+token_cache = TokenCache(settings.token_cache_size, settings.token_cache_ttl_seconds)
+
+
+def _encode(claims: dict) -> str:
+    """Sign claims with the shared secret or the active keyring key."""
+    from jose import jwt
+    
+    if uses_asymmetric_keys():
+        kid, private_key = get_keyring().signing_key
+        return jwt.encode(claims, private_key, algorithm=settings.algorithm, headers={"kid": kid})
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+
+def _decode(token: str) -> dict:
+    """Verify a token's signature and registered claims and return its payload."""
+    from jose import JWTError, jwt
+    
+    if uses_asymmetric_keys():
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = get_keyring().verification_key(kid)
+        if public_key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, public_key, algorithms=[settings.algorithm])
+    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
 
 
 def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    # if expires_delta:
-    #     expire = datetime.datetime.utcnow() + expires_delta
-    # else:
-    #     expire = datetime.datetime.utcnow() + datetime.timedelta(
-    #         minutes=settings.access_token_expire_minutes
-    #     )
-    # to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    # Short-lived: clients renew through /auth/refresh, and logout only has
+    # to revoke the refresh token for the session to end
+    if expires_delta:
+        expire = datetime.datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.datetime.utcnow() + datetime.timedelta(
+            minutes=settings.access_token_expire_minutes
+        )
+    to_encode.update({"exp": expire})
+    encoded_jwt = _encode(to_encode)
     return encoded_jwt
 
 
+def create_user_access_token(user) -> str:
+    """Create an access token carrying the claims needed to authenticate without a DB lookup."""
+    return create_access_token(data={
+        "sub": user.username,
+        "uid": user.id,
+        "has_pin": bool(user.hashed_pin),
+        "google": bool(user.is_google_user),
+        "ver": user.token_version or 0,
+    })
+
+
+def pin_fingerprint(hashed_pin: str) -> str:
+    """Short digest of the stored PIN hash; changes whenever the PIN is set, changed or removed."""
+    return hashlib.sha256(hashed_pin.encode()).hexdigest()[:16]
+
+
+def create_pin_token(user, expires_delta: Optional[datetime.timedelta] = None) -> tuple[str, int]:
+    """Create a short-lived elevated token after a successful PIN verification.
+    
+    Carries the user id, token version and a fingerprint of the PIN hash,
+    so a password reset or any PIN change revokes it. Returns
+    (token, expires_in_seconds).
+    """
+    if expires_delta is None:
+        expires_delta = datetime.timedelta(minutes=settings.pin_token_expire_minutes)
+    expire = datetime.datetime.utcnow() + expires_delta
+    to_encode = {
+        "sub": user.username,
+        "uid": user.id,
+        "ver": user.token_version or 0,
+        "pin": pin_fingerprint(user.hashed_pin),
+        "pin_verified": True,
+        "exp": expire,
+    }
+    encoded_jwt = _encode(to_encode)
+    return encoded_jwt, int(expires_delta.total_seconds())
+
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT token."""
+    from jose import JWTError
+    
+    if token_cache.enabled:
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+    
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
+        payload = _decode(token)
     except JWTError:
-        return None 
\ No newline at end of file
+        return None
+    
+    if token_cache.enabled:
+        token_cache.put(token, payload)
+    return payload
@@ -0,0 +1,112 @@
+"""In-memory signing keyring for asymmetric JWTs."""
+
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"ES256", "ES384", "ES512", "RS256", "RS384", "RS512"}
+
+
+class KeyRing:
+    """Private keys for signing and public keys for verifying, indexed by ``kid``.
+    
+    Keys are loaded from ``<keys_dir>/<kid>.pem``. The active kid signs new
+    tokens; every other key in the directory is still accepted for
+    verification so tokens survive a rotation until they expire.
+    """
+    
+    def __init__(self, algorithm: str, keys_dir: Optional[str] = None, active_kid: Optional[str] = None):
+        self.algorithm = algorithm
+        self.active_kid: Optional[str] = None
+        self._private_keys: dict[str, str] = {}
+        self._public_keys: dict[str, str] = {}
+        self._jwks_json: bytes = b'{"keys": []}'
+        self._load(keys_dir, active_kid)
+    
+    def _add_key(self, kid: str, private_pem: bytes) -> None:
+        from cryptography.hazmat.primitives import serialization
+        
+        private_key = serialization.load_pem_private_key(private_pem, password=None)
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self._private_keys[kid] = private_pem.decode()
+        self._public_keys[kid] = public_pem.decode()
+    
+    def _load(self, keys_dir: Optional[str], active_kid: Optional[str]) -> None:
+        # cryptography and jose are only needed once asymmetric signing is in use
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from jose import jwk
+        
+        if keys_dir and os.path.isdir(keys_dir):
+            for filename in sorted(os.listdir(keys_dir)):
+                if filename.endswith(".pem"):
+                    with open(os.path.join(keys_dir, filename), "rb") as f:
+                        self._add_key(filename[:-4], f.read())
+        
+        if not self._private_keys:
+            if self.algorithm != "ES256":
+                raise RuntimeError(f"No signing keys found in JWT_KEYS_DIR for {self.algorithm}")
+            if settings.is_production:
+                # An ephemeral key per worker would reject tokens signed by
+                # any other worker and every token issued before a restart
+                raise RuntimeError(f"No signing keys found in JWT_KEYS_DIR ({keys_dir}); required in production")
+            # Development fallback: tokens won't verify across workers or restarts
+            logger.warning("No JWT signing keys configured, generating an ephemeral ES256 key")
+            private_pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()
+            )
+            self._add_key("ephemeral", private_pem)
+        
+        self.active_kid = active_kid if active_kid in self._private_keys else sorted(self._private_keys)[-1]
+        logger.info(f"Loaded {len(self._private_keys)} JWT key(s), signing with kid={self.active_kid}")
+        
+        keys = []
+        for kid, public_pem in self._public_keys.items():
+            key = jwk.construct(public_pem, self.algorithm).to_dict()
+            key.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(key)
+        self._jwks_json = json.dumps({"keys": keys}, separators=(",", ":")).encode()
+    
+    @property
+    def signing_key(self) -> tuple[str, str]:
+        """Return (kid, private key PEM) used for new tokens."""
+        return self.active_kid, self._private_keys[self.active_kid]
+    
+    def verification_key(self, kid: Optional[str]) -> Optional[str]:
+        """Return the public key PEM for a kid, or None if unknown."""
+        return self._public_keys.get(kid)
+    
+    @property
+    def jwks_json(self) -> bytes:
+        """Serialized JWKS document."""
+        return self._jwks_json
+
+
+_keyring: Optional[KeyRing] = None
+_keyring_lock = threading.Lock()
+
+
+def get_keyring() -> KeyRing:
+    """Return the global keyring, loading keys on first use."""
+    global _keyring
+    if _keyring is None:
+        with _keyring_lock:
+            if _keyring is None:
+                _keyring = KeyRing(settings.algorithm, settings.jwt_keys_dir, settings.jwt_active_kid)
+    return _keyring
+
+
+def uses_asymmetric_keys() -> bool:
+    """Whether tokens are signed with the keyring instead of ``secret_key``."""
+    return settings.algorithm in ASYMMETRIC_ALGORITHMS
@@ -2,32 +2,105 @@
 
 import secrets
 import random
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING
 
-# Password context for hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.utils.hash_pool import hash_pool
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+def build_crypt_context() -> "CryptContext":
+    """Build the password context from settings.
+
+    The first configured scheme hashes new secrets; the others are only
+    accepted for verification and flagged by ``needs_update`` so they get
+    upgraded on the next successful login.
+    """
+    from passlib.context import CryptContext
+    
+    schemes = [s.strip() for s in settings.password_schemes.split(",") if s.strip()]
+    options = {}
+    if "bcrypt" in schemes:
+        options["bcrypt__default_rounds"] = settings.bcrypt_rounds
+        options["bcrypt__min_rounds"] = settings.bcrypt_rounds
+    if "argon2" in schemes:
+        options["argon2__type"] = "ID"
+        options["argon2__time_cost"] = settings.argon2_time_cost
+        options["argon2__memory_cost"] = settings.argon2_memory_cost
+        options["argon2__parallelism"] = settings.argon2_parallelism
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """Return the password context, building it (and importing passlib) on first use."""
+    return build_crypt_context()
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_pin_hash(pin: str) -> str:
     """Hash a PIN."""
-    return pwd_context.hash(pin)
+    return get_pwd_context().hash(pin)
 
 
 def verify_pin(plain_pin: str, hashed_pin: str) -> bool:
     """Verify a PIN against its hash."""
     if not hashed_pin:
         return False
-    return pwd_context.verify(plain_pin, hashed_pin)
+    return get_pwd_context().verify(plain_pin, hashed_pin)
+
+
+def verify_and_update(plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """Verify a secret and return a replacement hash if the stored one is outdated."""
+    if not hashed:
+        return False, None
+    return get_pwd_context().verify_and_update(plain, hashed)
+
+
+def is_known_hash(hashed: str) -> bool:
+    """Whether a stored hash uses one of the configured schemes."""
+    return bool(hashed) and get_pwd_context().identify(hashed, required=False) is not None
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hash pool."""
+    return await hash_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash on the hash pool."""
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_pin_hash_async(pin: str) -> str:
+    """Hash a PIN on the hash pool."""
+    return await hash_pool.run(get_pin_hash, pin)
+
+
+async def verify_pin_async(plain_pin: str, hashed_pin: str) -> bool:
+    """Verify a PIN against its hash on the hash pool."""
+    if not hashed_pin:
+        return False
+    return await hash_pool.run(verify_pin, plain_pin, hashed_pin)
+
+
+async def verify_and_update_async(plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """Verify a secret on the hash pool, returning a replacement hash if needed."""
+    if not hashed:
+        return False, None
+    return await hash_pool.run(verify_and_update, plain, hashed)
 
 
 def validate_password(password: str) -> tuple[bool, str]:
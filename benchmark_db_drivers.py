@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Database driver benchmark.
+Runs the hot UserService lookups and ResetService token checks against
+each MySQL driver and reports throughput and p50/p99 latency, so the
+MYSQL_DRIVER / MYSQL_ASYNC_DRIVER settings can be picked from numbers.
+
+Seeds --users bench_* accounts (with one reset token each) and removes
+them again when done.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User
+from app.services.user_service import UserService
+from app.services.reset_service import ResetService
+from app.services.async_user_service import AsyncUserService
+from app.services.async_reset_service import AsyncResetService
+
+SYNC_DRIVERS = {"mysqldb", "pymysql"}
+ASYNC_DRIVERS = {"aiomysql", "asyncmy"}
+BENCH_PREFIX = "bench_"
+
+
+def report(label: str, timings: list[float], elapsed: float) -> None:
+    """Print throughput and p50/p99 for a set of timings in milliseconds."""
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"  {label:<28} {len(ordered) / elapsed:9.0f} ops/s  "
+        f"p50={statistics.median(ordered):7.3f} ms  p99={p99:7.3f} ms"
+    )
+
+
+def seed(engine, count: int) -> list[dict]:
+    """Insert benchmark users with a live reset token each; returns their lookup keys."""
+    with Session(engine) as db:
+        db.execute(delete(User).where(User.username.like(f"{BENCH_PREFIX}%")))
+        db.commit()
+        UserService.bulk_insert_users(db, [
+            {"username": f"{BENCH_PREFIX}{i}", "email": f"{BENCH_PREFIX}{i}@example.com", "hashed_password": "x"}
+            for i in range(count)
+        ])
+        keys = []
+        for user in db.query(User).filter(User.username.like(f"{BENCH_PREFIX}%")).all():
+            token, code = ResetService.create_reset_token(db, user.id, "password")
+            keys.append({"username": user.username, "email": user.email, "token": token, "code": code})
+    return keys
+
+
+def cleanup(engine) -> None:
+    """Remove benchmark users (their reset tokens go by ON DELETE CASCADE)."""
+    with Session(engine) as db:
+        db.execute(delete(User).where(User.username.like(f"{BENCH_PREFIX}%")))
+        db.commit()
+
+
+def sync_flows(keys: list[dict]) -> dict:
+    return {
+        "get_user_by_username": lambda db, k: UserService.get_user_by_username(db, k["username"]),
+        "get_user_by_email": lambda db, k: UserService.get_user_by_email(db, k["email"]),
+        "get_user_by_username_or_email": lambda db, k: UserService.get_user_by_username_or_email(db, k["email"]),
+        "verify_reset_token": lambda db, k: ResetService.verify_reset_token(db, k["token"], "password"),
+        "verify_reset_code": lambda db, k: ResetService.verify_reset_code(db, k["email"], k["code"], "password"),
+    }
+
+
+def async_flows(keys: list[dict]) -> dict:
+    return {
+        "get_user_by_username": lambda db, k: AsyncUserService.get_user_by_username(db, k["username"]),
+        "get_user_by_email": lambda db, k: AsyncUserService.get_user_by_email(db, k["email"]),
+        "get_user_by_username_or_email": lambda db, k: AsyncUserService.get_user_by_username_or_email(db, k["email"]),
+        "verify_reset_token": lambda db, k: AsyncResetService.verify_reset_token(db, k["token"], "password"),
+        "verify_reset_code": lambda db, k: AsyncResetService.verify_reset_code(db, k["email"], k["code"], "password"),
+    }
+
+
+def run_sync(driver: str, keys: list[dict], iterations: int) -> None:
+    engine = create_engine(settings.mysql_url(driver), pool_size=1, pool_pre_ping=False)
+    try:
+        for name, flow in sync_flows(keys).items():
+            timings = []
+            with Session(engine) as db:
+                flow(db, keys[0])  # warm the connection and statement cache
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    key = random.choice(keys)
+                    start = time.perf_counter()
+                    flow(db, key)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    db.expunge_all()
+                elapsed = time.perf_counter() - started
+            report(name, timings, elapsed)
+    finally:
+        engine.dispose()
+
+
+async def run_async(driver: str, keys: list[dict], iterations: int) -> None:
+    engine = create_async_engine(settings.mysql_url(driver), pool_size=1, pool_pre_ping=False)
+    try:
+        for name, flow in async_flows(keys).items():
+            timings = []
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                await flow(db, keys[0])
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    key = random.choice(keys)
+                    start = time.perf_counter()
+                    await flow(db, key)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    db.expunge_all()
+                elapsed = time.perf_counter() - started
+            report(name, timings, elapsed)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    """Benchmark MySQL drivers on the hot service paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--drivers", default="mysqldb,pymysql,aiomysql",
+                        help="Comma-separated drivers: mysqldb, pymysql, aiomysql, asyncmy")
+    parser.add_argument("--users", type=int, default=1000, help="Benchmark accounts to seed")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per flow per driver")
+    args = parser.parse_args()
+
+    drivers = [d.strip() for d in args.drivers.split(",") if d.strip()]
+    unknown = [d for d in drivers if d not in SYNC_DRIVERS | ASYNC_DRIVERS]
+    if unknown:
+        parser.error(f"unknown driver(s): {', '.join(unknown)}")
+    if settings.database_url_override:
+        parser.error("driver benchmark needs the MYSQL_* settings, not DATABASE_URL")
+
+    print(f"⏱️  Driver benchmark: {args.users} users, {args.iterations} calls per flow")
+    print("=" * 40)
+
+    seed_driver = next((d for d in drivers if d in SYNC_DRIVERS), "pymysql")
+    seed_engine = create_engine(settings.mysql_url(seed_driver))
+    try:
+        keys = seed(seed_engine, args.users)
+        for driver in drivers:
+            print(f"\n{driver}")
+            try:
+                if driver in SYNC_DRIVERS:
+                    run_sync(driver, keys, args.iterations)
+                else:
+                    asyncio.run(run_async(driver, keys, args.iterations))
+            except ImportError as e:
+                print(f"  skipped, driver not installed: {str(e)}")
+    except Exception as e:
+        print(f"\n❌ Benchmark failed: {str(e)}")
+        sys.exit(1)
+    finally:
+        cleanup(seed_engine)
+        seed_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Token verification microbenchmark.
+Compares verify_token latency on a cache miss (full decode and HMAC check)
+against a cache hit.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.utils.jwt import create_access_token, token_cache, verify_token
+
+
+def time_calls(func, iterations: int) -> list[float]:
+    """Return per-call latencies in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    """Print p50/p99 for a set of timings."""
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {label:<6} p50={statistics.median(ordered):8.2f} us  p99={p99:8.2f} us")
+
+
+def main():
+    """Run the token cache microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    token = create_access_token(data={"sub": "benchmark-user"})
+
+    def miss():
+        token_cache.clear()
+        verify_token(token)
+
+    def hit():
+        verify_token(token)
+
+    print("⏱️  verify_token microbenchmark")
+    print("=" * 40)
+    if not token_cache.enabled:
+        print("Token cache is disabled (TOKEN_CACHE_SIZE/TOKEN_CACHE_TTL_SECONDS)")
+    report("miss", time_calls(miss, args.iterations))
+    verify_token(token)
+    report("hit", time_calls(hit, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
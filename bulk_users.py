@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Bulk user import/export.
+Streams CSV or NDJSON accounts into the users table in batches, hashing
+passwords on every core, and streams them back out with a server-side cursor.
+
+  python bulk_users.py import district.csv --emails queue --email-queue outbox.ndjson
+  python bulk_users.py export --format ndjson --output users.ndjson
+  python bulk_users.py send-emails outbox.ndjson
+
+Import columns: username, email, and either password or hashed_password
+(optionally pin or hashed_pin). Pre-hashed values must use a configured
+PASSWORD_SCHEMES scheme.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional, TextIO
+
+from app.db.database import SessionLocal
+from app.models import User
+from app.services.email_service import EmailService
+from app.services.user_service import UserService
+from app.utils.security import get_password_hash, get_pin_hash, is_known_hash, validate_password, validate_pin
+
+EXPORT_FIELDS = ["id", "username", "email", "is_google_user", "google_id", "has_pin"]
+EXPORT_FIELDS_WITH_HASHES = ["id", "username", "email", "is_google_user", "google_id", "hashed_password", "hashed_pin"]
+
+# Checked up front: values that don't fit must be rejected, never truncated
+USER_COLUMN_LENGTHS = {
+    column: User.__table__.c[column].type.length
+    for column in ("username", "email", "hashed_password", "hashed_pin")
+}
+
+
+def detect_format(path: str, fmt: Optional[str]) -> str:
+    """Pick csv or ndjson from the flag or the file extension."""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def open_input(path: str) -> TextIO:
+    return sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+
+
+def open_output(path: str) -> TextIO:
+    return sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[dict]:
+    """Yield input records one at a time."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+    else:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            # A bad line is reported as a reject instead of ending the import
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield {"_error": f"line {line_number}: invalid JSON ({str(e)})"}
+                continue
+            if not isinstance(row, dict):
+                yield {"_error": f"line {line_number}: expected a JSON object"}
+                continue
+            yield row
+
+
+def batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def check_row(row: dict) -> Optional[str]:
+    """Return why a row can't be imported, or None if it is valid."""
+    if row.get("_error"):
+        return row["_error"]
+    if not row.get("username"):
+        return "missing username"
+    for column in ("username", "email", "password", "hashed_password", "hashed_pin"):
+        value = row.get(column)
+        if value is None or value == "":
+            continue
+        if not isinstance(value, str):
+            return f"{column} must be a string"
+        if len(value) > USER_COLUMN_LENGTHS.get(column, len(value)):
+            return f"{column} is longer than {USER_COLUMN_LENGTHS[column]} characters"
+    if row.get("hashed_password"):
+        if not is_known_hash(row["hashed_password"]):
+            return "hashed_password uses an unsupported scheme"
+    elif row.get("password"):
+        is_valid, message = validate_password(row["password"])
+        if not is_valid:
+            return message
+    else:
+        return "missing password or hashed_password"
+    if row.get("hashed_pin"):
+        if not is_known_hash(row["hashed_pin"]):
+            return "hashed_pin uses an unsupported scheme"
+    elif row.get("pin"):
+        is_valid, message = validate_pin(str(row["pin"]))
+        if not is_valid:
+            return message
+    return None
+
+
+def hash_batch(executor: ProcessPoolExecutor, rows: list[dict], workers: int) -> None:
+    """Fill in hashed_password/hashed_pin for rows that carry plaintext, across all workers."""
+    for plain_key, hash_key, hasher in (("password", "hashed_password", get_password_hash), ("pin", "hashed_pin", get_pin_hash)):
+        pending = [row for row in rows if not row.get(hash_key) and row.get(plain_key)]
+        if not pending:
+            continue
+        chunksize = max(1, len(pending) // (workers * 4))
+        secrets = [str(row[plain_key]) for row in pending]
+        for row, hashed in zip(pending, executor.map(hasher, secrets, chunksize=chunksize)):
+            row[hash_key] = hashed
+
+
+def import_users(args) -> None:
+    fmt = detect_format(args.input, args.format)
+    workers = args.workers or os.cpu_count() or 1
+    rejects = open_output(args.rejects) if args.rejects else None
+    outbox = open(args.email_queue, "a", encoding="utf-8") if args.emails == "queue" else None
+
+    totals = {"read": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+    seen_usernames, seen_emails = set(), set()
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        with open_input(args.input) as stream, ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in batched(read_rows(stream, fmt), args.batch_size):
+                totals["read"] += len(batch)
+
+                valid = []
+                for row in batch:
+                    # A blank email means none: store NULL, never a '' that the unique index would see
+                    if isinstance(row.get("email"), str) and not row["email"].strip():
+                        row["email"] = None
+                    reason = check_row(row)
+                    if reason is None and (row["username"] in seen_usernames or (row.get("email") and row["email"] in seen_emails)):
+                        reason = "duplicate within input"
+                    if reason:
+                        totals["rejected"] += 1
+                        if rejects:
+                            rejects.write(json.dumps({"username": row.get("username"), "reason": reason}, default=str) + "\n")
+                        continue
+                    seen_usernames.add(row["username"])
+                    if row.get("email"):
+                        seen_emails.add(row["email"])
+                    valid.append(row)
+
+                # Drop accounts that already exist before spending CPU on their hashes
+                existing_usernames, existing_emails = UserService.find_existing_users(
+                    db, (row["username"] for row in valid), (row.get("email") for row in valid)
+                )
+                new_rows = [
+                    row for row in valid
+                    if row["username"] not in existing_usernames and row.get("email") not in existing_emails
+                ]
+                totals["duplicates"] += len(valid) - len(new_rows)
+
+                hash_batch(executor, new_rows, workers)
+                inserted = UserService.bulk_insert_users(db, new_rows)
+                totals["inserted"] += len(inserted)
+                totals["duplicates"] += len(new_rows) - len(inserted)
+
+                # Only accounts this import created get a welcome email
+                if args.emails != "suppress":
+                    for row in inserted:
+                        if not row.get("email"):
+                            continue
+                        if outbox:
+                            outbox.write(json.dumps({"email": row["email"], "username": row["username"]}) + "\n")
+                        else:
+                            EmailService.send_welcome_email(row["email"], row["username"])
+
+                elapsed = time.perf_counter() - started
+                print(
+                    f"  {totals['read']:>9} read  {totals['inserted']:>9} inserted  "
+                    f"{totals['duplicates']:>7} duplicate  {totals['rejected']:>7} rejected  "
+                    f"{totals['read'] / elapsed:8.0f} rows/s",
+                    file=sys.stderr
+                )
+    finally:
+        db.close()
+        if rejects and rejects is not sys.stdout:
+            rejects.close()
+        if outbox:
+            outbox.close()
+
+    print(f"\n✅ Import finished: {totals}", file=sys.stderr)
+
+
+def export_users(args) -> None:
+    fields = EXPORT_FIELDS_WITH_HASHES if args.include_hashes else EXPORT_FIELDS
+    count = 0
+
+    db = SessionLocal()
+    try:
+        output = open_output(args.output)
+        try:
+            writer = csv.DictWriter(output, fieldnames=fields) if args.format == "csv" else None
+            if writer:
+                writer.writeheader()
+            for user in UserService.stream_users(db, args.batch_size, args.include_hashes):
+                if writer:
+                    writer.writerow(user)
+                else:
+                    output.write(json.dumps(user) + "\n")
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    finally:
+        db.close()
+
+    print(f"✅ Exported {count} users", file=sys.stderr)
+
+
+def send_queued_emails(args) -> None:
+    sent = failed = 0
+    with open_input(args.input) as stream:
+        for row in read_rows(stream, "ndjson"):
+            if row.get("email") and EmailService.send_welcome_email(row["email"], row["username"]):
+                sent += 1
+            else:
+                failed += 1
+    print(f"✅ Sent {sent} welcome emails ({failed} failed)", file=sys.stderr)
+
+
+def main():
+    """Bulk import or export users."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Stream CSV/NDJSON users into the database")
+    importer.add_argument("input", help="Input file, or - for stdin")
+    importer.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    importer.add_argument("--batch-size", type=int, default=1000, help="Rows per multi-row INSERT")
+    importer.add_argument("--workers", type=int, default=0, help="Hashing processes (0 = one per core)")
+    importer.add_argument("--emails", choices=["suppress", "queue", "send"], default="suppress",
+                          help="Welcome emails: skip, append to --email-queue, or send inline")
+    importer.add_argument("--email-queue", default="welcome_emails.ndjson", help="Outbox file for --emails queue")
+    importer.add_argument("--rejects", help="Write rejected rows with reasons to this NDJSON file")
+    importer.set_defaults(handler=import_users)
+
+    exporter = commands.add_parser("export", help="Stream users out with a server-side cursor")
+    exporter.add_argument("--format", choices=["csv", "ndjson"], default="ndjson")
+    exporter.add_argument("--output", default="-", help="Output file, or - for stdout")
+    exporter.add_argument("--batch-size", type=int, default=1000, help="Rows fetched per round trip")
+    exporter.add_argument("--include-hashes", action="store_true",
+                          help="Include password/PIN hashes so the export can be re-imported")
+    exporter.set_defaults(handler=export_users)
+
+    sender = commands.add_parser("send-emails", help="Send welcome emails queued by an import")
+    sender.add_argument("input", help="Outbox NDJSON file written by --emails queue")
+    sender.set_defaults(handler=send_queued_emails)
+
+    args = parser.parse_args()
+
+    try:
+        args.handler(args)
+    except Exception as e:
+        print(f"\n❌ {args.command} failed: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Password hashing cost calibration.
+Run this on the target host to pick the highest cost that keeps a single
+verification under the given latency budget.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from passlib.hash import argon2, bcrypt
+
+from app.core.config import settings
+
+SAMPLE_SECRET = "Calibrate1234"
+
+
+def measure_verify_ms(handler, samples: int) -> float:
+    """Return the median verification time in milliseconds for a handler."""
+    hashed = handler.hash(SAMPLE_SECRET)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.verify(SAMPLE_SECRET, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> int:
+    """Find the highest bcrypt rounds value under the latency target."""
+    best = 4
+    for rounds in range(4, 32):
+        elapsed = measure_verify_ms(bcrypt.using(rounds=rounds), samples)
+        print(f"  bcrypt rounds={rounds:<2} {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = rounds
+    return best
+
+
+def calibrate_argon2(target_ms: float, samples: int) -> int:
+    """Find the highest argon2id time cost under the latency target at the configured memory cost."""
+    best = 1
+    for time_cost in range(1, 33):
+        handler = argon2.using(
+            type="ID",
+            time_cost=time_cost,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+        )
+        elapsed = measure_verify_ms(handler, samples)
+        print(f"  argon2id time_cost={time_cost:<2} {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = time_cost
+    return best
+
+
+def main():
+    """Calibrate hashing cost for this host."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verification latency")
+    parser.add_argument("--samples", type=int, default=3, help="Verifications per cost step")
+    args = parser.parse_args()
+
+    print(f"🔧 Calibrating {args.scheme} for a {args.target_ms:.0f} ms verification budget")
+    print("=" * 40)
+
+    try:
+        if args.scheme == "bcrypt":
+            rounds = calibrate_bcrypt(args.target_ms, args.samples)
+            print(f"\n✅ Suggested setting:\nBCRYPT_ROUNDS={rounds}")
+        else:
+            time_cost = calibrate_argon2(args.target_ms, args.samples)
+            print(
+                f"\n✅ Suggested settings:\nPASSWORD_SCHEMES=argon2,bcrypt\n"
+                f"ARGON2_TIME_COST={time_cost}\n"
+                f"ARGON2_MEMORY_COST={settings.argon2_memory_cost}\n"
+                f"ARGON2_PARALLELISM={settings.argon2_parallelism}"
+            )
+    except Exception as e:
+        print(f"\n❌ Calibration failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,27 @@ Main FastAPI application entry point.
 """
 
 import logging
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from app.core.startup_profile import startup_profile
+
+with startup_profile.phase("fastapi", kind="import"):
+    from fastapi import FastAPI, Request, status
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse, Response
 
 from app.core.config import settings
-from app.db import create_tables
-from app.db.migrations import run_migrations
-from app.api.v1.router import api_router
+
+with startup_profile.phase("app.db", kind="import"):
+    from app.db import async_engine, replica_engines
+    from app.db.migrations import run_migrations, check_schema_version
+
+with startup_profile.phase("app.api", kind="import"):
+    from app.api.v1.router import api_router
+    from app.core.middleware import sql_instrumentation_middleware
+
+with startup_profile.phase("background services", kind="import"):
+    from app.services.token_purge import token_purge_task
+    from app.utils.hash_pool import hash_pool, HashPoolSaturated
+    from app.utils.keyring import get_keyring, uses_asymmetric_keys
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,26 +48,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count SQL statements per request (Server-Timing, query budgets, N+1 warnings)
+if settings.sql_instrumentation:
+    app.middleware("http")(sql_instrumentation_middleware)
+
 # Include API router
 app.include_router(api_router)
 
 
+@app.exception_handler(HashPoolSaturated)
+async def hash_pool_saturated_handler(request: Request, exc: HashPoolSaturated):
+    """Shed CPU-heavy auth requests when the hashing queue is over budget."""
+    logger.warning(f"Hash pool saturated, rejecting {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup event."""
     logger.info("Starting ChildSafe API...")
     
-    # Create database tables
-    create_tables()
-    logger.info("Database tables created/verified")
+    # Check (or, with AUTO_MIGRATE, apply) database migrations. Production
+    # never runs DDL on boot; migrations ship through migrate_database.py.
+    with startup_profile.phase("schema check"):
+        try:
+            if settings.auto_migrate and not settings.is_production:
+                run_migrations()
+            else:
+                if settings.auto_migrate:
+                    logger.warning("AUTO_MIGRATE is ignored in production")
+                check_schema_version()
+        except Exception as e:
+            logger.error(f"Migration check failed: {str(e)}")
+            # Don't stop the application, just log the error
     
-    # Run database migrations
-    try:
-        run_migrations()
-    except Exception as e:
-        logger.error(f"Migration failed: {str(e)}")
-        # Don't stop the application, just log the error
+    # Start periodic cleanup of used and expired tokens
+    with startup_profile.phase("token purge task"):
+        token_purge_task.start()
     
+    # Load signing keys up front so the first login doesn't pay for it
+    if uses_asymmetric_keys():
+        with startup_profile.phase("signing keys"):
+            get_keyring()
+    
+    startup_profile.mark_ready()
+    startup_profile.log_report(settings.startup_budget_ms)
     logger.info("ChildSafe API started successfully!")
 
 
@@ -61,6 +104,17 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event."""
     logger.info("Shutting down ChildSafe API...")
+    
+    # Stop background token cleanup
+    await token_purge_task.stop()
+    
+    # Stop password hashing workers
+    hash_pool.shutdown()
+    
+    # Close async database connections
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
 
 
 @app.get("/")
@@ -75,6 +129,19 @@ async def root():
     }
 
 
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks():
+    """Public signing keys for verifying access tokens offline."""
+    body = get_keyring().jwks_json if uses_asymmetric_keys() else b'{"keys":[]}'
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}, stale-while-revalidate=86400"
+        },
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
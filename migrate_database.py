@@ -4,9 +4,11 @@ Manual database migration script.
 Run this if you need to update the database schema manually.
 """
 
+import argparse
 import logging
 import sys
-from app.db.migrations import run_migrations
+from app.db.database import engine
+from app.db.migrations import run_migrations, get_schema_version, SCHEMA_VERSION
 
 # Configure logging
 logging.basicConfig(
@@ -19,9 +21,19 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Run database migrations manually."""
+    parser = argparse.ArgumentParser(description="Apply pending ChildSafe database migrations.")
+    parser.add_argument("--status", action="store_true", help="Only show the current schema version")
+    args = parser.parse_args()
+    
     print("🔄 ChildSafe Database Migration")
     print("=" * 40)
     
+    if args.status:
+        with engine.connect() as connection:
+            version = get_schema_version(connection)
+        print(f"Database schema version: {version} (code expects {SCHEMA_VERSION})")
+        sys.exit(0 if version >= SCHEMA_VERSION else 1)
+    
     try:
         run_migrations()
         print("\n✅ Database migration completed successfully!")